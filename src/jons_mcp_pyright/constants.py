@@ -9,6 +9,9 @@ DIAGNOSTIC_WAIT_TIMEOUT: float = float(os.environ.get("PYRIGHT_DIAG_TIMEOUT", "5
 
 # Buffer sizes
 READ_BUFFER_SIZE: int = 4096
+# asyncio StreamReader limit for pyright's stdout; large responses such as
+# workspace-wide references arrive without pausing the pipe as often
+STREAM_BUFFER_LIMIT: int = 1024 * 1024
 
 # LSP Protocol
 CONTENT_LENGTH_HEADER: str = "Content-Length: "
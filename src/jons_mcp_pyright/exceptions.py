@@ -54,7 +54,7 @@ class DocumentSyncError(RuntimeError):
     code = "document_sync_error"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """LSP position in a text document."""
 
@@ -65,7 +65,7 @@ class Position:
         return {"line": self.line, "character": self.character}
 
 
-@dataclass
+@dataclass(slots=True)
 class Range:
     """LSP range in a text document."""
 
@@ -2,25 +2,63 @@
 
 import asyncio
 import contextlib
-import json
 import logging
 import os
-import queue
 import shlex
 import shutil
 import subprocess
 import sys
-import threading
 from collections.abc import Callable
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Protocol, cast
 
-from .constants import REQUEST_TIMEOUT
+import orjson
+
+from .constants import (
+    CONTENT_LENGTH_HEADER,
+    HEADER_SEPARATOR,
+    REQUEST_TIMEOUT,
+    SHUTDOWN_TIMEOUT,
+    STREAM_BUFFER_LIMIT,
+)
 from .exceptions import LSPRequestError, PyrightNotFoundError
 
 logger = logging.getLogger(__name__)
 
 
+class _Writer(Protocol):
+    """The part of the process's stdin stream the client writes frames to."""
+
+    def write(self, data: bytes | bytearray) -> None: ...
+
+    async def drain(self) -> None: ...
+
+
+class _Process(Protocol):
+    """The part of asyncio.subprocess.Process the client uses."""
+
+    @property
+    def pid(self) -> int: ...
+
+    @property
+    def returncode(self) -> int | None: ...
+
+    @property
+    def stdin(self) -> _Writer | None: ...
+
+    @property
+    def stdout(self) -> asyncio.StreamReader | None: ...
+
+    @property
+    def stderr(self) -> asyncio.StreamReader | None: ...
+
+    def terminate(self) -> None: ...
+
+    def kill(self) -> None: ...
+
+    async def wait(self) -> int: ...
+
+
 def get_python_interpreter(project_root: Path, config: dict[str, Any]) -> str | None:
     """Determine the Python interpreter path from config or environment."""
     # First check if pythonPath is explicitly set in config
@@ -83,8 +121,40 @@ def get_python_interpreter(project_root: Path, config: dict[str, Any]) -> str |
     return None
 
 
+# Header block template written before each body, and the field name the
+# reader looks for; the space after the colon is optional when parsing
+_HEADER_TEMPLATE = CONTENT_LENGTH_HEADER.encode("ascii") + b"%d" + HEADER_SEPARATOR
+_CONTENT_LENGTH_FIELD = CONTENT_LENGTH_HEADER.rstrip().encode("ascii")
+
+
+def _content_header(length: int) -> bytes:
+    """Return the LSP header block for a body of the given byte length."""
+    return _HEADER_TEMPLATE % length
+
+
+def _frame(content: bytes) -> bytes:
+    """Prefix an encoded JSON-RPC body with its LSP Content-Length header."""
+    return _content_header(len(content)) + content
+
+
+def _content_length(header: bytes) -> int | None:
+    """Return the Content-Length of an LSP header block, or None if absent.
+
+    The header block must end with CRLF, as returned by readuntil().
+    """
+    start = header.find(_CONTENT_LENGTH_FIELD)
+    if start == -1:
+        return None
+    value_start = start + len(_CONTENT_LENGTH_FIELD)
+    return int(header[value_start : header.find(b"\r\n", start)])
+
+
+# The exit notification never varies, so it is framed once at import
+_EXIT_FRAME = _frame(orjson.dumps({"jsonrpc": "2.0", "method": "exit", "params": {}}))
+
+
 class PyrightClient:
-    """Thread-based LSP client for pyright."""
+    """Asyncio-based LSP client for pyright."""
 
     def __init__(
         self,
@@ -95,21 +165,30 @@ class PyrightClient:
         self.project_root = project_root
         self.config = config or {}
         self.pyright_path = pyright_path or self._find_pyright()
-        self.process: subprocess.Popen | None = None
+        self.process: _Process | None = None
+        # Ids are never reused, so a late reply to a timed-out request
+        # cannot resolve a newer request's future
         self.request_id = 0
         self.pending_requests: dict[int, asyncio.Future] = {}
-        self.notification_handlers: dict[str, Callable[..., Any]] = {}
+        # Handlers keyed by method, each with whether it is a coroutine
+        # function; register them through on_notification()
+        self._notification_handlers: dict[str, tuple[Callable[..., Any], bool]] = {}
         self._initialized = False
         self._shutting_down = False
         self.request_timeout = REQUEST_TIMEOUT
 
-        # Thread-based I/O
-        self._reader_thread: threading.Thread | None = None
-        self._stderr_thread: threading.Thread | None = None
-        self._writer_lock = threading.Lock()
-        self._message_queue: queue.Queue[dict[str, Any]] = queue.Queue()
-        self._loop: asyncio.AbstractEventLoop | None = None
-        self._message_task: asyncio.Task[None] | None = None
+        # Encoded ',"method":...,"params":' fragments keyed by method name
+        self._method_prefixes: dict[str, bytes] = {}
+
+        # Frames queued during the current loop iteration, written together
+        self._out_buf = bytearray()
+        self._flush_scheduled = False
+        # Why the last flush failed, re-raised to every writer in that batch
+        self._flush_error: Exception | None = None
+
+        # Background tasks draining the process's stdout and stderr pipes
+        self._reader_task: asyncio.Task[None] | None = None
+        self._stderr_task: asyncio.Task[None] | None = None
 
     def _find_pyright(self) -> str:
         """Find pyright executable."""
@@ -170,9 +249,6 @@ class PyrightClient:
         if self.process:
             raise RuntimeError("Already started")
 
-        # Store event loop for thread-to-async communication
-        self._loop = asyncio.get_running_loop()
-
         logger.info(f"Starting pyright for project: {self.project_root}")
         logger.info(f"Using pyright command: {self.pyright_path}")
 
@@ -181,31 +257,22 @@ class PyrightClient:
         env["PYTHONUNBUFFERED"] = "1"
 
         try:
-            self.process = subprocess.Popen(
-                shlex.split(self.pyright_path),
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            self.process = await asyncio.create_subprocess_exec(
+                *shlex.split(self.pyright_path),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=str(self.project_root),
                 env=env,
-                bufsize=0,  # Unbuffered
+                limit=STREAM_BUFFER_LIMIT,
             )
         except Exception as e:
             raise RuntimeError(f"Failed to start pyright: {e}") from e
 
         try:
-            # Start reader threads
-            self._reader_thread = threading.Thread(
-                target=self._reader_loop, daemon=True
-            )
-            self._stderr_thread = threading.Thread(
-                target=self._stderr_loop, daemon=True
-            )
-            self._reader_thread.start()
-            self._stderr_thread.start()
-
-            # Process messages from queue
-            self._message_task = asyncio.create_task(self._process_messages())
+            # Drain stdout and stderr on the event loop
+            self._reader_task = asyncio.create_task(self._read_loop())
+            self._stderr_task = asyncio.create_task(self._stderr_loop())
 
             # Initialize LSP connection
             await self._initialize()
@@ -213,76 +280,56 @@ class PyrightClient:
             await self._cleanup_started_process()
             raise
 
-    def _reader_loop(self) -> None:
-        """Read messages from stdout in a thread."""
-        buffer = b""
-        logger.debug("Reader thread started")
+    async def _read_loop(self) -> None:
+        """Read and dispatch messages from stdout.
+
+        Each message is read in two steps: the header block up to the blank
+        line, then exactly Content-Length bytes of body.
+        """
+        logger.debug("Reader task started")
 
         while self.process and not self._shutting_down:
             try:
                 stdout = self.process.stdout
                 if not stdout:
                     break
-                # Read one byte at a time to avoid blocking
-                byte = stdout.read(1)
-                if not byte:
-                    logger.debug("Reader thread: EOF")
-                    break
-
-                buffer += byte
-
-                # Check for complete message
-                header_end = buffer.find(b"\r\n\r\n")
-                if header_end == -1:
-                    continue
-
-                # Parse header
-                header = buffer[:header_end].decode("utf-8")
-                content_length = None
-                for line in header.split("\r\n"):
-                    if line.startswith("Content-Length: "):
-                        content_length = int(line[16:])
-                        break
-
+                header = await stdout.readuntil(HEADER_SEPARATOR)
+                content_length = _content_length(header)
                 if content_length is None:
-                    buffer = buffer[header_end + 4 :]
+                    logger.error("Skipping LSP message without Content-Length header")
                     continue
 
-                # Read content
-                content_start = header_end + 4
-                while len(buffer) < content_start + content_length:
-                    chunk = stdout.read(
-                        min(4096, content_start + content_length - len(buffer))
-                    )
-                    if not chunk:
-                        return
-                    buffer += chunk
-
-                # Extract message
-                content = buffer[content_start : content_start + content_length]
-                buffer = buffer[content_start + content_length :]
-
+                body = await stdout.readexactly(content_length)
                 try:
-                    message = json.loads(content.decode("utf-8"))
-                    # Put message in queue for async processing
-                    method_or_id = message.get(
-                        "method", f"response id={message.get('id')}"
-                    )
-                    logger.debug(f"Reader thread: queuing message {method_or_id}")
-                    self._message_queue.put(message)
-                except json.JSONDecodeError as e:
+                    message = orjson.loads(body)
+                except orjson.JSONDecodeError as e:
                     logger.error(f"Failed to parse JSON: {e}")
+                    continue
+
+                await self._dispatch_message(message)
 
+            except asyncio.IncompleteReadError:
+                logger.debug("Reader task: EOF")
+                break
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 if not self._shutting_down:
-                    logger.error(f"Error in reader thread: {e}")
+                    logger.error(f"Error in reader task: {e}")
                 break
 
-    def _stderr_loop(self) -> None:
-        """Read stderr in a thread."""
+    async def _dispatch_message(self, message: dict[str, Any]) -> None:
+        """Handle one message, logging rather than propagating errors."""
+        try:
+            await self._handle_message(message)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+
+    async def _stderr_loop(self) -> None:
+        """Log lines written to stderr."""
         while self.process and self.process.stderr and not self._shutting_down:
             try:
-                line = self.process.stderr.readline()
+                line = await self.process.stderr.readline()
                 if line:
                     decoded = line.decode().strip()
                     if "error" in decoded.lower() or "panic" in decoded.lower():
@@ -291,129 +338,111 @@ class PyrightClient:
                         logger.info(f"pyright stderr: {decoded}")
                 else:
                     break
+            except asyncio.CancelledError:
+                raise
             except Exception:
                 break
 
-    async def _process_messages(self) -> None:
-        """Process messages from the queue."""
-        logger.debug("Message processor started")
-        while not self._shutting_down:
-            try:
-                # Use a simple approach - check if queue has items
-                if not self._message_queue.empty():
-                    message = self._message_queue.get_nowait()
-                    logger.debug(
-                        f"Processing message from queue: {message.get('method', 'response')}"
-                    )
-                    await self._handle_message(message)
-                else:
-                    # Small sleep to avoid busy waiting
-                    await asyncio.sleep(0.01)
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error processing message: {e}")
-
     async def _handle_message(self, message: dict[str, Any]) -> None:
         """Handle incoming LSP message."""
-        logger.debug(f"Received: {message}")
-
-        if "id" in message and "method" in message:
-            # Request from server to client
-            request_id = message["id"]
-            method = message["method"]
-            params = message.get("params", {})
-
-            logger.debug(f"Server request: {method} (id={request_id})")
-
-            # Handle workspace/configuration request
-            if method == "workspace/configuration":
-                # Build response based on requested configuration sections
-                result = []
-                items = params.get("items", [])
-
-                for item in items:
-                    section = item.get("section", "")
-                    config_response: dict[str, Any] = {}
-
-                    if section == "python":
-                        # Provide Python interpreter path if we have it
-                        python_path = get_python_interpreter(
-                            self.project_root, self.config
-                        )
-                        if python_path:
-                            config_response["defaultInterpreterPath"] = python_path
-                            config_response["pythonPath"] = python_path
-                    elif section == "python.analysis":
-                        # Provide analysis settings
-                        if "extraPaths" in self.config:
-                            extra_paths = cast(list[str], self.config["extraPaths"])
-                            # Convert relative paths to absolute
-                            abs_paths = []
-                            for path in extra_paths:
-                                if not Path(path).is_absolute():
-                                    abs_paths.append(str(self.project_root / path))
-                                else:
-                                    abs_paths.append(path)
-                            config_response["extraPaths"] = abs_paths
-                        if "typeCheckingMode" in self.config:
-                            config_response["typeCheckingMode"] = self.config[
-                                "typeCheckingMode"
-                            ]
-                    elif section == "pyright":
-                        # Return the full pyright config if requested
-                        config_response = self.config.copy()
-
-                    result.append(config_response)
-
-                await self._send_message(
-                    {"jsonrpc": "2.0", "id": request_id, "result": result}
-                )
+        logger.debug("Received: %s", message)
+
+        method = message.get("method")
+        if method is None:
+            # Response to our request; every message without a method has an id
+            future = self.pending_requests.pop(message["id"], None)
+            if future is None or future.done():
+                return
+            error = message.get("error")
+            if error is None:
+                future.set_result(message.get("result"))
             else:
-                # Send error response for unsupported methods
-                await self._send_message(
-                    {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {
-                            "code": -32601,
-                            "message": f"Method not supported: {method}",
-                        },
-                    }
-                )
-        elif "id" in message:
-            # Response to our request
-            request_id = message["id"]
-            future = self.pending_requests.pop(request_id, None)
-
-            if future and not future.done():
-                if "error" in message:
-                    error = message["error"]
-                    future.set_exception(
-                        LSPRequestError(
-                            f"{error.get('message', 'Unknown error')}",
-                            code=error.get("code"),
-                        )
+                future.set_exception(
+                    LSPRequestError(
+                        f"{error.get('message', 'Unknown error')}",
+                        code=error.get("code"),
                     )
+                )
+            return
+
+        params = message.get("params", {})
+        if "id" in message:
+            await self._handle_server_request(message["id"], method, params)
+            return
+
+        # Server notification
+        entry = self._notification_handlers.get(method)
+        if entry:
+            handler, is_async = entry
+            try:
+                if is_async:
+                    await handler(params)
                 else:
-                    future.set_result(message.get("result"))
+                    handler(params)
+            except Exception as e:
+                logger.error(f"Error in notification handler for {method}: {e}")
         else:
-            # Server notification
-            method = message.get("method", "")
-            params = message.get("params", {})
-
-            handler = self.notification_handlers.get(method)
-            if handler:
-                try:
-                    # Check if handler is async
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(params)
-                    else:
-                        handler(params)
-                except Exception as e:
-                    logger.error(f"Error in notification handler for {method}: {e}")
-            else:
-                logger.debug(f"Unhandled notification: {method}")
+            logger.debug(f"Unhandled notification: {method}")
+
+    async def _handle_server_request(
+        self, request_id: int | str, method: str, params: Any
+    ) -> None:
+        """Reply to a request sent by the server to the client."""
+        logger.debug(f"Server request: {method} (id={request_id})")
+
+        # Handle workspace/configuration request
+        if method == "workspace/configuration":
+            # Build response based on requested configuration sections
+            result = []
+            items = params.get("items", [])
+
+            for item in items:
+                section = item.get("section", "")
+                config_response: dict[str, Any] = {}
+
+                if section == "python":
+                    # Provide Python interpreter path if we have it
+                    python_path = get_python_interpreter(self.project_root, self.config)
+                    if python_path:
+                        config_response["defaultInterpreterPath"] = python_path
+                        config_response["pythonPath"] = python_path
+                elif section == "python.analysis":
+                    # Provide analysis settings
+                    if "extraPaths" in self.config:
+                        extra_paths = cast(list[str], self.config["extraPaths"])
+                        # Convert relative paths to absolute
+                        abs_paths = []
+                        for path in extra_paths:
+                            if not Path(path).is_absolute():
+                                abs_paths.append(str(self.project_root / path))
+                            else:
+                                abs_paths.append(path)
+                        config_response["extraPaths"] = abs_paths
+                    if "typeCheckingMode" in self.config:
+                        config_response["typeCheckingMode"] = self.config[
+                            "typeCheckingMode"
+                        ]
+                elif section == "pyright":
+                    # Return the full pyright config if requested
+                    config_response = self.config.copy()
+
+                result.append(config_response)
+
+            await self._send_message(
+                {"jsonrpc": "2.0", "id": request_id, "result": result}
+            )
+        else:
+            # Send error response for unsupported methods
+            await self._send_message(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32601,
+                        "message": f"Method not supported: {method}",
+                    },
+                }
+            )
 
     async def _initialize(self) -> None:
         """Send LSP initialize request."""
@@ -548,68 +577,140 @@ class PyrightClient:
         logger.debug(f"Creating request {method} with id {request_id}")
 
         # Create future for response
-        future: asyncio.Future = asyncio.Future()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
         self.pending_requests[request_id] = future
 
         # Send request
-        await self._send_message(
-            {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "method": method,
-                "params": params or {},
-            }
-        )
-
-        # Wait for response with timeout
         try:
-            logger.debug(f"Waiting for response to {method} (id={request_id})")
-            result = await asyncio.wait_for(future, timeout=self.request_timeout)
-            logger.debug(f"Got response for {method} (id={request_id}): {result}")
-            return result
-        except asyncio.TimeoutError:
-            self.pending_requests.pop(request_id, None)
-            logger.error(
-                f"Request {method} (id={request_id}) timed out. "
-                f"Pending requests: {list(self.pending_requests.keys())}"
+            await self._write_message(
+                b'{"jsonrpc":"2.0","id":%d' % request_id,
+                self._method_prefix(method),
+                orjson.dumps(params or {}),
+                b"}",
             )
-            raise LSPRequestError(
+        except Exception:
+            self.pending_requests.pop(request_id, None)
+            raise
+
+        # Wait for response; the timer fails the future if none arrives
+        logger.debug(f"Waiting for response to {method} (id={request_id})")
+        timer = loop.call_later(
+            self.request_timeout, self._expire_request, request_id, method
+        )
+        try:
+            result = await future
+        finally:
+            timer.cancel()
+        logger.debug(f"Got response for {method} (id={request_id}): {result}")
+        return result
+
+    def _expire_request(self, request_id: int, method: str) -> None:
+        """Fail a pending request whose response did not arrive in time."""
+        future = self.pending_requests.pop(request_id, None)
+        if future is None or future.done():
+            return
+        logger.error(
+            f"Request {method} (id={request_id}) timed out. "
+            f"Pending requests: {list(self.pending_requests.keys())}"
+        )
+        future.set_exception(
+            LSPRequestError(
                 f"Request {method} timed out after {self.request_timeout}s",
                 is_retryable=True,
-            ) from None
+            )
+        )
 
     async def notify(self, method: str, params: Any = None) -> None:
         """Send notification (no response expected)."""
-        await self._send_message(
-            {"jsonrpc": "2.0", "method": method, "params": params or {}}
+        await self._write_message(
+            b'{"jsonrpc":"2.0"',
+            self._method_prefix(method),
+            orjson.dumps(params or {}),
+            b"}",
         )
 
+    def _method_prefix(self, method: str) -> bytes:
+        """Return the cached encoded method and params key for a message."""
+        prefix = self._method_prefixes.get(method)
+        if prefix is None:
+            prefix = b',"method":' + orjson.dumps(method) + b',"params":'
+            self._method_prefixes[method] = prefix
+        return prefix
+
     async def _send_message(self, message: dict[str, Any]) -> None:
         """Send message to pyright."""
-        if not self.process or not self.process.stdin:
-            raise RuntimeError("Process not running")
+        await self._write_message(orjson.dumps(message))
+        logger.debug(f"Sent: {message}")
 
-        content = json.dumps(message).encode("utf-8")
-        header = f"Content-Length: {len(content)}\r\n\r\n".encode()
+    async def _write_message(self, *body_parts: bytes) -> None:
+        """Queue a JSON-RPC body, given as consecutive pieces, with its header.
 
-        # Thread-safe write
-        with self._writer_lock:
-            self.process.stdin.write(header + content)
-            self.process.stdin.flush()
+        The pieces are appended to the output buffer one by one, so neither
+        the body nor the header and body are concatenated first.
+        """
+        await self._write(_content_header(sum(map(len, body_parts))), *body_parts)
 
-        logger.debug(f"Sent: {message}")
+    async def _write(self, *chunks: bytes) -> None:
+        """Queue bytes that form complete LSP frames for writing to pyright.
+
+        Frames queued in the same event-loop iteration are coalesced into a
+        single write by _flush_out. If that write fails, every caller whose
+        frames were in the batch raises LSPRequestError.
+        """
+        if not self.process or not self.process.stdin:
+            raise RuntimeError("Process not running")
+        # shutdown() may clear self.process while this coroutine is suspended
+        stdin = self.process.stdin
+
+        for chunk in chunks:
+            self._out_buf += chunk
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_out)
+
+        # Yield so the scheduled flush runs, then apply backpressure
+        await asyncio.sleep(0)
+        if self._flush_error is not None:
+            raise LSPRequestError(
+                f"Error writing to pyright: {self._flush_error}", is_retryable=True
+            ) from self._flush_error
+        await stdin.drain()
+
+    def _flush_out(self) -> None:
+        """Write all queued frames to stdin in one call."""
+        self._flush_scheduled = False
+        self._flush_error = None
+        # Hand the buffer itself to the transport, which copies whatever it
+        # cannot write immediately, and start a fresh one
+        data = self._out_buf
+        self._out_buf = bytearray()
+        if not self.process or not self.process.stdin:
+            # The process went away after these frames were queued
+            if data:
+                self._flush_error = ConnectionResetError(
+                    "pyright process is not running"
+                )
+            return
+        try:
+            self.process.stdin.write(data)
+        except Exception as e:
+            logger.error(f"Error writing to pyright: {e}")
+            self._flush_error = e
 
     def on_notification(self, method: str, handler: Callable[..., Any]) -> None:
         """Register notification handler."""
-        self.notification_handlers[method] = handler
+        self._notification_handlers[method] = (
+            handler,
+            asyncio.iscoroutinefunction(handler),
+        )
 
     async def _cleanup_started_process(self) -> None:
         """Clean up a process that failed during startup."""
         self._shutting_down = True
         self._fail_pending_requests("pyright startup failed")
-        await self._cancel_message_task()
-        self._terminate_process()
-        self._join_threads()
+        await self._terminate_process()
+        await self._cancel_io_tasks()
         self.process = None
         self._initialized = False
         self._shutting_down = False
@@ -621,35 +722,31 @@ class PyrightClient:
                 future.set_exception(LSPRequestError(message, is_retryable=True))
         self.pending_requests.clear()
 
-    async def _cancel_message_task(self) -> None:
-        """Cancel the async message processing task if it exists."""
-        if self._message_task and not self._message_task.done():
-            self._message_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._message_task
-        self._message_task = None
-
-    def _terminate_process(self) -> None:
+    async def _cancel_io_tasks(self) -> None:
+        """Cancel the stdout and stderr reader tasks if they exist."""
+        for task in (self._reader_task, self._stderr_task):
+            if task and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._reader_task = None
+        self._stderr_task = None
+
+    async def _terminate_process(self) -> None:
         """Terminate or kill the subprocess if still running."""
         if not self.process:
             return
-        if self.process.poll() is None:
+        if self.process.returncode is None:
             logger.debug("Process still running, terminating...")
-            self.process.terminate()
+            with contextlib.suppress(ProcessLookupError):
+                self.process.terminate()
             try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
+                await asyncio.wait_for(self.process.wait(), timeout=SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
                 logger.debug("Process didn't terminate, killing...")
-                self.process.kill()
-                self.process.wait()
-
-    def _join_threads(self) -> None:
-        """Join background reader threads briefly during shutdown."""
-        for thread in (self._reader_thread, self._stderr_thread):
-            if thread and thread.is_alive():
-                thread.join(timeout=1)
-        self._reader_thread = None
-        self._stderr_thread = None
+                with contextlib.suppress(ProcessLookupError):
+                    self.process.kill()
+                await self.process.wait()
 
     async def shutdown(self) -> None:
         """Shutdown the language server."""
@@ -667,7 +764,7 @@ class PyrightClient:
             self._shutting_down = True
 
             # Send exit notification
-            await self.notify("exit", {})
+            await self._write(_EXIT_FRAME)
 
             # Give it a moment to exit cleanly
             await asyncio.sleep(0.5)
@@ -676,9 +773,8 @@ class PyrightClient:
             self._shutting_down = True
 
         self._fail_pending_requests("pyright server shut down")
-        await self._cancel_message_task()
-        self._terminate_process()
-        self._join_threads()
+        await self._terminate_process()
+        await self._cancel_io_tasks()
 
         self.process = None
         self._initialized = False
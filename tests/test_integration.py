@@ -28,7 +28,8 @@ from jons_mcp_pyright.tools.extensions import list_environments, restart_server
 class TestPyrightIntegration:
     """Integration tests with real pyright process."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.integration
+
     async def test_basic_symbol_info(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -49,7 +50,6 @@ class TestPyrightIntegration:
         # Check that we got some hover info
         assert len(contents) > 0
 
-    @pytest.mark.asyncio
     async def test_find_definition(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -81,7 +81,6 @@ sum_val = add(1, 2)
         assert location["uri"].endswith("main.py")
         assert "range" in location
 
-    @pytest.mark.asyncio
     async def test_document_symbols(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -108,7 +107,6 @@ sum_val = add(1, 2)
         assert "Calculator" in names
         assert "__init__" in names
 
-    @pytest.mark.asyncio
     async def test_preview_rename_symbol(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -139,8 +137,9 @@ another = old_function()
             file_uri = rename_file.resolve().as_uri()
             assert any(edit["uri"] == file_uri for edit in result["edits"])
 
-    @pytest.mark.asyncio
-    async def test_preview_rename_includes_imported_references(self, tmp_path: Path):
+    async def test_preview_rename_includes_imported_references(
+        self, tmp_path: Path, monkeypatch
+    ):
         """Cold uv workspace rename preview should prewarm cross-package callers."""
         has_pyright = importlib.util.find_spec("pyright") is not None
         if not has_pyright and not shutil.which("pyright-langserver"):
@@ -186,8 +185,8 @@ another = old_function()
         manager = PyrightClientManager(tmp_path)
         try:
             await manager.start_root_client()
-            server_module.manager = manager
-            server_module.initialization_complete = True
+            monkeypatch.setattr(server_module, "manager", manager)
+            monkeypatch.setattr(server_module, "initialization_complete", True)
             await asyncio.sleep(1.5)
 
             result = await preview_rename(
@@ -207,11 +206,8 @@ another = old_function()
                 assert any(edit["uri"] == init_uri for edit in result["edits"]), result
                 assert result["totalEdits"] >= 3
         finally:
-            server_module.initialization_complete = False
             await manager.shutdown_all()
-            server_module.manager = None
 
-    @pytest.mark.asyncio
     async def test_type_info_on_class_instance(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -247,7 +243,6 @@ calc.
         assert "methods" in result
         assert "totalItems" in result["methods"]
 
-    @pytest.mark.asyncio
     async def test_type_info_on_primitive(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -271,7 +266,6 @@ y = x + 10
             # If we get a result, verify it identifies the type
             assert result["typeName"] in ("int", "Literal[42]", "unknown")
 
-    @pytest.mark.asyncio
     async def test_type_definition(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -298,12 +292,10 @@ calc: Calculator = Calculator(10)
             assert "main.py" in location["uri"]
             assert "range" in location
 
-    @pytest.mark.asyncio
     async def test_references(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
         """Test references tool finds all usages."""
-        # The greet function is used in test_main.py
         main_file = temp_python_project / "src" / "main.py"
 
         result = await references(
@@ -322,7 +314,6 @@ calc: Calculator = Calculator(10)
         for item in result["items"]:
             assert "uri" in item
 
-    @pytest.mark.asyncio
     async def test_diagnostics_with_error(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -353,40 +344,34 @@ result = add_numbers("hello", 5)
         assert "hasMore" in result
 
 
-@pytest.mark.asyncio
-async def test_mcp_server_lifecycle():
+async def test_mcp_server_lifecycle(monkeypatch):
     """Test the MCP server lifecycle management."""
     # This test verifies the lifespan context manager works correctly
     server = mcp
 
     # Mock the global manager variable
-    original_manager = server_module.manager
-    server_module.manager = None
-
-    try:
-        # Test that lifespan is properly configured
-        assert server.lifespan is not None
+    monkeypatch.setattr(server_module, "manager", None)
 
-        # The server should have our tools registered
-        tools = {tool.name for tool in await server.list_tools()}
-        assert "symbol_info" in tools
-        assert "type_info" in tools
-        assert "definition" in tools
-        assert "diagnostics" in tools
-        assert "preview_rename" in tools
-        assert "implementation" not in tools
-        assert "restart_server" in tools
-        assert "list_environments" in tools
+    # Test that lifespan is properly configured
+    assert server.lifespan is not None
 
-    finally:
-        # Restore original
-        server_module.manager = original_manager
+    # The server should have our tools registered
+    tools = {tool.name for tool in await server.list_tools()}
+    assert "symbol_info" in tools
+    assert "type_info" in tools
+    assert "definition" in tools
+    assert "diagnostics" in tools
+    assert "preview_rename" in tools
+    assert "implementation" not in tools
+    assert "restart_server" in tools
+    assert "list_environments" in tools
 
 
 class TestMultiEnvironment:
     """Integration tests for multi-environment support."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.integration
+
     async def test_environment_discovery(
         self, multi_env_manager: PyrightClientManager, multi_env_project: Path
     ):
@@ -399,7 +384,6 @@ class TestMultiEnvironment:
         assert str(multi_env_project / "packages" / "pkg-a") in env_ids
         assert str(multi_env_project / "packages" / "pkg-b") in env_ids
 
-    @pytest.mark.asyncio
     async def test_file_routing(
         self, multi_env_manager: PyrightClientManager, multi_env_project: Path
     ):
@@ -422,7 +406,6 @@ class TestMultiEnvironment:
         assert pkg_b_env is not None
         assert pkg_b_env.env_id == str(multi_env_project / "packages" / "pkg-b")
 
-    @pytest.mark.asyncio
     async def test_list_environments_tool(
         self, multi_env_manager: PyrightClientManager, multi_env_project: Path
     ):
@@ -438,7 +421,6 @@ class TestMultiEnvironment:
         assert str(multi_env_project / "packages" / "pkg-a") in env_ids
         assert str(multi_env_project / "packages" / "pkg-b") in env_ids
 
-    @pytest.mark.asyncio
     async def test_symbol_info_routes_to_correct_env(
         self, multi_env_manager: PyrightClientManager, multi_env_project: Path
     ):
@@ -455,7 +437,6 @@ class TestMultiEnvironment:
         assert "content" in result
         # Should get info about func_a
 
-    @pytest.mark.asyncio
     async def test_document_symbols_per_env(
         self, multi_env_manager: PyrightClientManager, multi_env_project: Path
     ):
@@ -478,7 +459,6 @@ class TestMultiEnvironment:
         assert "func_b" in names_b
         assert "ClassB" in names_b
 
-    @pytest.mark.asyncio
     async def test_restart_environment_by_file(
         self, multi_env_manager: PyrightClientManager, multi_env_project: Path
     ):
@@ -495,7 +475,6 @@ class TestMultiEnvironment:
         assert result["status"] == "restarted"
         assert result["scope"] == "environment"
 
-    @pytest.mark.asyncio
     async def test_restart_environment_by_id(
         self, multi_env_manager: PyrightClientManager, multi_env_project: Path
     ):
@@ -516,7 +495,6 @@ class TestMultiEnvironment:
             "env_id": pkg_b_path,
         }
 
-    @pytest.mark.asyncio
     async def test_backward_compatibility_single_env(
         self, pyright_manager: PyrightClientManager, temp_python_project: Path
     ):
@@ -537,7 +515,8 @@ class TestMultiEnvironment:
 class TestLRUEviction:
     """Test LRU eviction behavior."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.integration
+
     async def test_lru_eviction_with_max_clients(
         self, multi_env_project: Path, monkeypatch
     ):
@@ -553,8 +532,8 @@ class TestLRUEviction:
 
         try:
             await manager.start_root_client()
-            server_module.manager = manager
-            server_module.initialization_complete = True
+            monkeypatch.setattr(server_module, "manager", manager)
+            monkeypatch.setattr(server_module, "initialization_complete", True)
 
             await asyncio.sleep(0.5)
 
@@ -589,15 +568,14 @@ class TestLRUEviction:
             assert final_active <= 2
 
         finally:
-            server_module.initialization_complete = False
             await manager.shutdown_all()
-            server_module.manager = None
 
 
 class TestProcessCleanup:
     """Test process cleanup on shutdown."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.integration
+
     async def test_no_zombie_processes(
         self, multi_env_manager: PyrightClientManager, multi_env_project: Path
     ):
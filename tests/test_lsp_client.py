@@ -4,11 +4,12 @@ Unit tests for the PyrightClient class.
 
 import asyncio
 import json
-import subprocess
+import shutil
 import sys
+import threading
 import unittest.mock
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -19,6 +20,66 @@ from jons_mcp_pyright import (
     PyrightNotFoundError,
     Range,
 )
+from jons_mcp_pyright.constants import STREAM_BUFFER_LIMIT
+
+# The exact bytes pyright should receive for the exit notification
+_EXPECTED_EXIT_FRAME = (
+    b'Content-Length: 45\r\n\r\n{"jsonrpc":"2.0","method":"exit","params":{}}'
+)
+
+
+class FakeStdin:
+    """Minimal stand-in for an asyncio StreamWriter that records writes."""
+
+    def __init__(self) -> None:
+        self.writes: list[bytes] = []
+
+    def write(self, data: bytes | bytearray) -> None:
+        self.writes.append(bytes(data))
+
+    async def drain(self) -> None:
+        pass
+
+
+class FakeProcess:
+    """Minimal stand-in for asyncio.subprocess.Process with EOF output streams."""
+
+    def __init__(self, returncode: int | None = None) -> None:
+        self.pid = 0
+        self.returncode = returncode
+        self.stdin = FakeStdin()
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_eof()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_eof()
+        self.terminate_calls = 0
+        self.kill_calls = 0
+        self.wait_calls = 0
+
+    def terminate(self) -> None:
+        self.terminate_calls += 1
+
+    def kill(self) -> None:
+        self.kill_calls += 1
+
+    async def wait(self) -> int:
+        self.wait_calls += 1
+        return 0
+
+
+async def _read_messages(client: PyrightClient, *chunks: bytes) -> list:
+    """Run the reader task over stdout chunks and collect dispatched messages."""
+    process = FakeProcess()
+    process.stdout = asyncio.StreamReader()
+    for chunk in chunks:
+        process.stdout.feed_data(chunk)
+    process.stdout.feed_eof()
+    client.process = process
+
+    handle = AsyncMock()
+    client._handle_message = handle
+    await client._read_loop()
+    return [call.args[0] for call in handle.await_args_list]
 
 
 class TestPyrightClient:
@@ -37,123 +98,288 @@ class TestPyrightClient:
         monkeypatch.delenv("PYRIGHT_PATH", raising=False)
 
         # Mock the pyright module
-        with patch.dict("sys.modules", {"pyright": MagicMock()}):
-            client = PyrightClient(tmp_path)
-            assert (
-                client.pyright_path == f"{sys.executable} -m pyright.langserver --stdio"
-            )
+        monkeypatch.setitem(sys.modules, "pyright", MagicMock())
+        client = PyrightClient(tmp_path)
+        assert client.pyright_path == f"{sys.executable} -m pyright.langserver --stdio"
 
     def test_find_pyright_on_path(self, tmp_path: Path, monkeypatch):
         """Test finding pyright-langserver on PATH."""
         monkeypatch.delenv("PYRIGHT_PATH", raising=False)
 
         # Mock no pyright module
-        with patch.dict("sys.modules", {"pyright": None}):
-            with patch("shutil.which") as mock_which:
-                mock_which.side_effect = lambda cmd: (
-                    "/usr/bin/pyright-langserver"
-                    if cmd == "pyright-langserver"
-                    else None
-                )
-                client = PyrightClient(tmp_path)
-                assert client.pyright_path == "/usr/bin/pyright-langserver"
+        monkeypatch.setitem(sys.modules, "pyright", None)
+        monkeypatch.setattr(
+            shutil,
+            "which",
+            lambda cmd: (
+                "/usr/bin/pyright-langserver" if cmd == "pyright-langserver" else None
+            ),
+        )
+        client = PyrightClient(tmp_path)
+        assert client.pyright_path == "/usr/bin/pyright-langserver"
 
     def test_find_pyright_cli_fallback(self, tmp_path: Path, monkeypatch):
         """Test finding pyright CLI with --langserver fallback."""
         monkeypatch.delenv("PYRIGHT_PATH", raising=False)
 
         # Mock no pyright module and no pyright-langserver
-        with patch.dict("sys.modules", {"pyright": None}):
-            with patch("shutil.which") as mock_which:
-
-                def which_side_effect(cmd):
-                    if cmd == "pyright":
-                        return "/usr/bin/pyright"
-                    return None
-
-                mock_which.side_effect = which_side_effect
+        monkeypatch.setitem(sys.modules, "pyright", None)
+        monkeypatch.setattr(
+            shutil,
+            "which",
+            lambda cmd: "/usr/bin/pyright" if cmd == "pyright" else None,
+        )
 
-                client = PyrightClient(tmp_path)
-                assert client.pyright_path == "/usr/bin/pyright --langserver"
+        client = PyrightClient(tmp_path)
+        assert client.pyright_path == "/usr/bin/pyright --langserver"
 
     def test_find_pyright_not_found(self, tmp_path: Path, monkeypatch):
         """Test error when pyright is not found."""
         monkeypatch.delenv("PYRIGHT_PATH", raising=False)
 
-        with patch.dict("sys.modules", {"pyright": None}):
-            with patch("shutil.which") as mock_which:
-                mock_which.return_value = None
-                with pytest.raises(PyrightNotFoundError, match="pyright not found"):
-                    PyrightClient(tmp_path)
+        monkeypatch.setitem(sys.modules, "pyright", None)
+        monkeypatch.setattr(shutil, "which", lambda cmd: None)
+        with pytest.raises(PyrightNotFoundError, match="pyright not found"):
+            PyrightClient(tmp_path)
 
-    @pytest.mark.asyncio
-    async def test_start_process(self, tmp_path: Path):
+    async def test_start_process(self, tmp_path: Path, monkeypatch):
         """Test starting the pyright process."""
         client = PyrightClient(tmp_path, pyright_path="echo test")
 
-        # Mock the subprocess
-        mock_process = AsyncMock()
-        mock_process.stdin = AsyncMock()
-        mock_process.stdout = AsyncMock()
-        mock_process.stderr = AsyncMock()
-
-        with patch("subprocess.Popen", return_value=mock_process) as mock_popen:
-            # Mock the initialization
-            with patch.object(client, "_initialize", new_callable=AsyncMock):
-                with patch("threading.Thread") as mock_thread:
-                    mock_thread_instance = MagicMock()
-                    mock_thread.return_value = mock_thread_instance
-                    await client.start()
-                    await client._cancel_message_task()
-
-        mock_popen.assert_called_once_with(
-            ["echo", "test"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+        # Fake the subprocess
+        process = FakeProcess()
+        mock_exec = AsyncMock(return_value=process)
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", mock_exec)
+        # Mock the initialization
+        monkeypatch.setattr(client, "_initialize", AsyncMock())
+        threads_before = threading.active_count()
+
+        await client.start()
+        # Pipe I/O runs as event-loop tasks rather than reader threads
+        assert isinstance(client._reader_task, asyncio.Task)
+        assert isinstance(client._stderr_task, asyncio.Task)
+        assert threading.active_count() == threads_before
+        await client._cancel_io_tasks()
+
+        mock_exec.assert_awaited_once_with(
+            "echo",
+            "test",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd=str(tmp_path),
             env=unittest.mock.ANY,
-            bufsize=0,
+            limit=STREAM_BUFFER_LIMIT,
         )
-        assert client.process == mock_process
+        assert client.process == process
 
-    @pytest.mark.asyncio
     async def test_send_message(self, tmp_path: Path):
         """Test sending LSP messages."""
         client = PyrightClient(tmp_path)
 
-        # Mock process with stdin
-        mock_stdin = MagicMock()
-        client.process = MagicMock()
-        client.process.stdin = mock_stdin
+        # Fake process with stdin
+        client.process = process = FakeProcess()
 
         message = {"jsonrpc": "2.0", "method": "test", "params": {}}
         await client._send_message(message)
 
-        # Check that proper LSP format was written
-        calls = mock_stdin.write.call_args_list
-        assert len(calls) == 1  # header + content combined
+        # Header and compact JSON content go out in a single write
+        assert process.stdin.writes == [
+            b'Content-Length: 45\r\n\r\n{"jsonrpc":"2.0","method":"test","params":{}}'
+        ]
+
+    async def test_send_message_content_length_counts_bytes(self, tmp_path: Path):
+        """Test Content-Length is the UTF-8 byte length of the body."""
+        client = PyrightClient(tmp_path)
+
+        client.process = process = FakeProcess()
+
+        message = {"jsonrpc": "2.0", "method": "test", "params": {"text": "héllo ✓"}}
+        await client._send_message(message)
+
+        (written_data,) = process.stdin.writes
+        header, body = written_data.split(b"\r\n\r\n", 1)
+        assert header == b"Content-Length: %d" % len(body)
+        assert json.loads(body) == message
+
+    async def test_notify_encodes_position_and_range_params(self, tmp_path: Path):
+        """Test Position/Range params encode without calling to_dict()."""
+        client = PyrightClient(tmp_path)
+        client.process = process = FakeProcess()
+
+        start = Position(line=1, character=2)
+        end = Position(line=3, character=4)
+        await client.notify("test", {"range": Range(start=start, end=end)})
+
+        (written_data,) = process.stdin.writes
+        assert written_data.endswith(
+            b'"params":{"range":{"start":{"line":1,"character":2},'
+            b'"end":{"line":3,"character":4}}}}'
+        )
+
+    async def test_send_message_coalesces_concurrent_writes(self, tmp_path: Path):
+        """Test messages sent in the same loop iteration share one write."""
+        client = PyrightClient(tmp_path)
+        client.process = process = FakeProcess()
+
+        await asyncio.gather(*(client.notify(f"test/{i}") for i in range(3)))
+
+        (written_data,) = process.stdin.writes
+        assert written_data.count(b"Content-Length: ") == 3
+        assert client._out_buf == b""
+        assert client._flush_scheduled is False
+
+    @pytest.mark.parametrize("method", ["notify", "request"])
+    async def test_write_fails_when_process_cleared_while_suspended(
+        self, method, tmp_path: Path
+    ):
+        """Test a shutdown racing a queued write fails it instead of hanging."""
+        client = PyrightClient(tmp_path)
+        client.process = process = FakeProcess()
+
+        task = asyncio.create_task(getattr(client, method)("test"))
+        await asyncio.sleep(0)  # Let the call queue its frame and yield
+        client.process = None
+
+        with pytest.raises(LSPRequestError, match="not running") as exc_info:
+            await task
+
+        assert exc_info.value.is_retryable
+        assert process.stdin.writes == []
+        assert client._out_buf == b""
+        assert client.pending_requests == {}
+
+    async def test_failed_flush_fails_every_write_in_batch(self, tmp_path: Path):
+        """Test a failed stdin write raises in each request of the batch."""
+        client = PyrightClient(tmp_path)
+        client.process = process = FakeProcess()
+        process.stdin.write = MagicMock(side_effect=BrokenPipeError("closed"))
+
+        results = await asyncio.gather(
+            client.request("test/a"), client.notify("test/b"), return_exceptions=True
+        )
+
+        for result in results:
+            assert isinstance(result, LSPRequestError)
+            assert result.is_retryable
+            assert "closed" in str(result)
+        assert client.pending_requests == {}
+        assert client._flush_error is not None
+
+        # The next batch is written normally again
+        process.stdin.write = MagicMock()
+        await client.notify("test/c")
+        process.stdin.write.assert_called_once()
+
+    async def test_request_and_notify_encoding(self, tmp_path: Path):
+        """Test requests and notifications encode full JSON-RPC envelopes."""
+        client = PyrightClient(tmp_path)
+        client.process = process = FakeProcess()
+        client.request_id = 7
+        client.request_timeout = 0  # No server; let each request expire
+
+        with pytest.raises(LSPRequestError):
+            await client.request("textDocument/hover", {"line": 1})
+        await client.notify('weird/"method"')
+        with pytest.raises(LSPRequestError):
+            await client.request("textDocument/hover", {"line": 2})
+
+        bodies = [
+            json.loads(data.split(b"\r\n\r\n", 1)[1]) for data in process.stdin.writes
+        ]
+        assert bodies == [
+            {
+                "jsonrpc": "2.0",
+                "id": 7,
+                "method": "textDocument/hover",
+                "params": {"line": 1},
+            },
+            {"jsonrpc": "2.0", "method": 'weird/"method"', "params": {}},
+            {
+                "jsonrpc": "2.0",
+                "id": 8,
+                "method": "textDocument/hover",
+                "params": {"line": 2},
+            },
+        ]
+
+    async def test_read_loop_complete(self, tmp_path: Path):
+        """Test reading a complete message."""
+        client = PyrightClient(tmp_path)
+
+        content = b'{"jsonrpc": "2.0", "id": 1, "result": "ok"}'
+        buffer = b"Content-Length: %d\r\n\r\n" % len(content) + content
 
-        # Check the complete message
-        written_data = calls[0][0][0]
-        written_str = written_data.decode("utf-8")
+        messages = await _read_messages(client, buffer)
 
-        # Should have header and content
-        assert "Content-Length: " in written_str
-        assert "\r\n\r\n" in written_str
+        assert messages == [{"jsonrpc": "2.0", "id": 1, "result": "ok"}]
 
-        # Extract content part
-        header_end = written_str.find("\r\n\r\n") + 4
-        content = written_str[header_end:]
-        assert json.loads(content) == message
+    async def test_read_loop_with_content_type_header(self, tmp_path: Path):
+        """Test Content-Length is found when other headers come first."""
+        client = PyrightClient(tmp_path)
+
+        content = b'{"jsonrpc": "2.0", "id": 1, "result": "ok"}'
+        buffer = b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n"
+        buffer += b"Content-Length: %d\r\n\r\n" % len(content) + content
+
+        messages = await _read_messages(client, buffer)
+
+        assert messages == [{"jsonrpc": "2.0", "id": 1, "result": "ok"}]
+
+    async def test_read_loop_incomplete_header(self, tmp_path: Path):
+        """Test that a truncated header dispatches nothing."""
+        client = PyrightClient(tmp_path)
+
+        messages = await _read_messages(client, b"Content-Length: 42\r\n")
+
+        assert messages == []
+
+    async def test_read_loop_incomplete_content(self, tmp_path: Path):
+        """Test that a truncated body dispatches nothing."""
+        client = PyrightClient(tmp_path)
+
+        messages = await _read_messages(
+            client, b'Content-Length: 42\r\n\r\n{"jsonrpc": "2.0"'
+        )
+
+        assert messages == []
+
+    async def test_read_loop_multiple(self, tmp_path: Path):
+        """Test reading back-to-back messages split across chunks."""
+        client = PyrightClient(tmp_path)
+
+        first = '{"jsonrpc": "2.0", "method": "a", "params": "héllo"}'.encode()
+        second = b'{"jsonrpc": "2.0", "id": 2, "result": null}'
+        buffer = b"Content-Length: %d\r\n\r\n" % len(first) + first
+        buffer += b"Content-Length: %d\r\n\r\n" % len(second) + second
+
+        # Split mid-header and mid-body to exercise reassembly
+        messages = await _read_messages(client, buffer[:10], buffer[10:40], buffer[40:])
+
+        assert messages == [
+            {"jsonrpc": "2.0", "method": "a", "params": "héllo"},
+            {"jsonrpc": "2.0", "id": 2, "result": None},
+        ]
+
+    async def test_read_loop_skips_malformed_messages(self, tmp_path: Path):
+        """Test that headers without Content-Length and bad JSON are skipped."""
+        client = PyrightClient(tmp_path)
+
+        content = b'{"jsonrpc": "2.0", "id": 3, "result": 1}'
+        buffer = b"Content-Type: x\r\n\r\n"
+        buffer += b"Content-Length: 5\r\n\r\nnope!"
+        buffer += b"Content-Length: %d\r\n\r\n" % len(content) + content
+
+        messages = await _read_messages(client, buffer)
+
+        assert messages == [{"jsonrpc": "2.0", "id": 3, "result": 1}]
 
-    @pytest.mark.asyncio
     async def test_handle_response(self, tmp_path: Path):
         """Test handling response messages."""
         client = PyrightClient(tmp_path)
 
         # Create a pending request
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         client.pending_requests[42] = future
 
         # Handle response
@@ -164,13 +390,12 @@ class TestPyrightClient:
         assert future.result() == {"data": "test"}
         assert 42 not in client.pending_requests
 
-    @pytest.mark.asyncio
     async def test_handle_error_response(self, tmp_path: Path):
         """Test handling error responses."""
         client = PyrightClient(tmp_path)
 
         # Create a pending request
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         client.pending_requests[42] = future
 
         # Handle error response
@@ -185,7 +410,22 @@ class TestPyrightClient:
         with pytest.raises(LSPRequestError, match="Method not found"):
             future.result()
 
-    @pytest.mark.asyncio
+    async def test_late_response_after_timeout_is_ignored(self, tmp_path: Path):
+        """Test a reply to a timed-out request does not resolve a newer one."""
+        client = PyrightClient(tmp_path)
+        client.process = FakeProcess()
+        client.request_timeout = 0
+
+        with pytest.raises(LSPRequestError, match="timed out"):
+            await client.request("slow")
+
+        future = asyncio.get_running_loop().create_future()
+        client.pending_requests[client.request_id] = future
+        await client._handle_message({"jsonrpc": "2.0", "id": 0, "result": "late"})
+
+        assert not future.done()
+        assert list(client.pending_requests) == [1]
+
     async def test_handle_notification(self, tmp_path: Path):
         """Test handling notification messages."""
         client = PyrightClient(tmp_path)
@@ -210,89 +450,128 @@ class TestPyrightClient:
 
         assert handler_called
 
-    @pytest.mark.asyncio
+    async def test_handle_notification_sync_handler(self, tmp_path: Path):
+        """Test sync handlers are called inline, including re-registration."""
+        client = PyrightClient(tmp_path)
+        received = []
+
+        async def async_handler(params):
+            received.append(("async", params))
+
+        client.on_notification("test/event", async_handler)
+        client.on_notification("test/event", lambda params: received.append(params))
+
+        await client._handle_message(
+            {"jsonrpc": "2.0", "method": "test/event", "params": {"n": 1}}
+        )
+
+        assert received == [{"n": 1}]
+
+    async def test_handle_notification_async_handler_replaces_sync(
+        self, tmp_path: Path
+    ):
+        """Test an async handler registered over a sync one is awaited."""
+        client = PyrightClient(tmp_path)
+        received = []
+
+        async def async_handler(params):
+            await asyncio.sleep(0)
+            received.append(("async", params))
+
+        client.on_notification("test/event", lambda params: received.append(params))
+        client.on_notification("test/event", async_handler)
+
+        await client._handle_message(
+            {"jsonrpc": "2.0", "method": "test/event", "params": {"n": 1}}
+        )
+
+        assert received == [("async", {"n": 1})]
+
     async def test_request_timeout(self, tmp_path: Path):
         """Test request timeout handling."""
         client = PyrightClient(tmp_path)
-        client.process = MagicMock()
-        client.process.stdin = MagicMock()
+        client.process = FakeProcess()
+        client.request_timeout = 0
 
         # Make a request that will timeout
-        with patch("jons_mcp_pyright.lsp_client.asyncio.wait_for") as mock_wait_for:
-            mock_wait_for.side_effect = asyncio.TimeoutError()
-            with pytest.raises(LSPRequestError, match="timed out"):
-                await client.request("test")
+        with pytest.raises(LSPRequestError, match="timed out") as exc_info:
+            await client.request("test")
 
         # Ensure request is cleaned up
+        assert exc_info.value.is_retryable
+        assert len(client.pending_requests) == 0
+
+    async def test_request_returns_response(self, tmp_path: Path):
+        """Test a response arriving before the timeout resolves the request."""
+        client = PyrightClient(tmp_path)
+        client.process = FakeProcess()
+
+        task = asyncio.create_task(client.request("test"))
+        while not client.pending_requests:
+            await asyncio.sleep(0)
+        await client._handle_message({"jsonrpc": "2.0", "id": 0, "result": "ok"})
+
+        assert await task == "ok"
         assert len(client.pending_requests) == 0
 
-    @pytest.mark.asyncio
-    async def test_shutdown(self, tmp_path: Path):
+    async def test_shutdown(self, tmp_path: Path, monkeypatch):
         """Test proper shutdown sequence."""
         client = PyrightClient(tmp_path)
 
-        # Mock process and methods
-        mock_process = MagicMock()
-        mock_process.wait = MagicMock()
-        mock_process.poll = MagicMock(return_value=0)  # Process already terminated
-        client.process = mock_process
+        # Fake process
+        process = FakeProcess(returncode=0)  # Process already terminated
+        client.process = process
 
-        # Mock request and notify methods
-        with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
-            with patch.object(client, "notify", new_callable=AsyncMock) as mock_notify:
-                await client.shutdown()
+        # Mock the shutdown request
+        mock_request = AsyncMock()
+        monkeypatch.setattr(client, "request", mock_request)
+        await client.shutdown()
 
-        # Verify shutdown sequence
+        # Verify shutdown sequence: shutdown request, then the exit notification
         mock_request.assert_called_once_with("shutdown", {})
-        mock_notify.assert_called_once_with("exit", {})
-        # wait should not be called because poll() returns 0 (terminated)
-        mock_process.wait.assert_not_called()
+        assert process.stdin.writes == [_EXPECTED_EXIT_FRAME]
+        # wait should not be called because the process already exited
+        assert process.wait_calls == 0
         assert client.process is None
         assert client._initialized is False
 
-    @pytest.mark.asyncio
-    async def test_shutdown_with_error(self, tmp_path: Path):
+    async def test_shutdown_with_error(self, tmp_path: Path, monkeypatch):
         """Test shutdown with errors."""
         client = PyrightClient(tmp_path)
 
-        # Mock process
-        mock_process = MagicMock()
-        mock_process.terminate = MagicMock()
-        mock_process.wait = MagicMock()  # Synchronous wait for timeout
-        mock_process.poll = MagicMock(return_value=None)  # Process still running
-        client.process = mock_process
+        # Fake process
+        process = FakeProcess()  # Process still running
+        client.process = process
 
         # Mock request to raise error
-        with patch.object(client, "request", side_effect=Exception("Shutdown failed")):
-            await client.shutdown()
+        monkeypatch.setattr(
+            client, "request", AsyncMock(side_effect=Exception("Shutdown failed"))
+        )
+        await client.shutdown()
 
-        # Verify process was terminated (because poll() returns None)
-        mock_process.terminate.assert_called_once()
-        mock_process.wait.assert_called_once_with(timeout=5)
+        # Verify process was terminated (because it had no returncode)
+        assert process.terminate_calls == 1
+        assert process.wait_calls == 1
 
-    @pytest.mark.asyncio
-    async def test_start_initialization_failure_cleans_process(self, tmp_path: Path):
+    async def test_start_initialization_failure_cleans_process(
+        self, tmp_path: Path, monkeypatch
+    ):
         """Startup failures should not leave a child process behind."""
         client = PyrightClient(tmp_path, pyright_path="echo test")
 
-        mock_process = MagicMock()
-        mock_process.stdin = MagicMock()
-        mock_process.stdout = MagicMock()
-        mock_process.stderr = MagicMock()
-        mock_process.poll.return_value = None
-
-        with patch("subprocess.Popen", return_value=mock_process):
-            with patch.object(
-                client, "_initialize", new_callable=AsyncMock
-            ) as mock_initialize:
-                mock_initialize.side_effect = RuntimeError("init failed")
-                with patch("threading.Thread") as mock_thread:
-                    mock_thread.return_value = MagicMock()
-                    with pytest.raises(RuntimeError, match="init failed"):
-                        await client.start()
-
-        mock_process.terminate.assert_called_once()
-        mock_process.wait.assert_called_once_with(timeout=5)
+        process = FakeProcess()
+        monkeypatch.setattr(
+            asyncio, "create_subprocess_exec", AsyncMock(return_value=process)
+        )
+        monkeypatch.setattr(
+            client, "_initialize", AsyncMock(side_effect=RuntimeError("init failed"))
+        )
+
+        with pytest.raises(RuntimeError, match="init failed"):
+            await client.start()
+
+        assert process.terminate_calls == 1
+        assert process.wait_calls == 1
         assert client.process is None
         assert client.is_initialized() is False
 
@@ -315,3 +594,9 @@ class TestPositionAndRange:
             "start": {"line": 10, "character": 5},
             "end": {"line": 10, "character": 10},
         }
+
+    def test_position_and_range_use_slots(self):
+        """Test Position and Range carry no per-instance __dict__."""
+        pos = Position(line=1, character=2)
+        assert not hasattr(pos, "__dict__")
+        assert not hasattr(Range(start=pos, end=pos), "__dict__")
@@ -1,7 +1,7 @@
 """Tests for PyrightClientManager."""
 
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -108,30 +108,25 @@ class TestGetEnvironmentForFile:
 class TestGetClientForFile:
     """Tests for get_client_for_file method."""
 
-    @pytest.mark.asyncio
-    async def test_creates_client_on_first_access(self, tmp_path):
+    async def test_creates_client_on_first_access(self, tmp_path, monkeypatch):
         """Should create and start client on first access."""
         (tmp_path / "pyproject.toml").write_text("")
 
         manager = PyrightClientManager(tmp_path)
 
-        # Mock the client creation
-        with patch.object(
-            manager, "_start_client", new_callable=AsyncMock
-        ) as mock_start:
-            # Manually set a mock client after _start_client is called
-            async def set_mock_client(env):
-                env.client = MagicMock()
+        # Mock the client creation, setting a mock client once started
+        async def set_mock_client(env):
+            env.client = MagicMock()
 
-            mock_start.side_effect = set_mock_client
+        mock_start = AsyncMock(side_effect=set_mock_client)
+        monkeypatch.setattr(manager, "_start_client", mock_start)
 
-            test_file = tmp_path / "main.py"
-            client = await manager.get_client_for_file(str(test_file))
+        test_file = tmp_path / "main.py"
+        client = await manager.get_client_for_file(str(test_file))
 
-            assert mock_start.called
-            assert client is not None
+        assert mock_start.called
+        assert client is not None
 
-    @pytest.mark.asyncio
     async def test_reuses_existing_client(self, tmp_path):
         """Should reuse existing client for same environment."""
         (tmp_path / "pyproject.toml").write_text("")
@@ -148,7 +143,6 @@ class TestGetClientForFile:
 
         assert client is mock_client
 
-    @pytest.mark.asyncio
     async def test_rejects_external_files(self, tmp_path):
         """Should reject files outside the configured project root."""
         (tmp_path / "pyproject.toml").write_text("")
@@ -168,8 +162,7 @@ class TestGetClientForFile:
 class TestLRUEviction:
     """Tests for LRU eviction behavior."""
 
-    @pytest.mark.asyncio
-    async def test_evicts_lru_when_at_limit(self, tmp_path):
+    async def test_evicts_lru_when_at_limit(self, tmp_path, monkeypatch):
         """Should evict least recently used client when at limit."""
         (tmp_path / "pyproject.toml").write_text("")
 
@@ -201,10 +194,8 @@ class TestLRUEviction:
         manager._active_count = 2
 
         # Starting client for env_b should evict root (oldest)
-        with patch.object(
-            PyrightClientManager, "_start_client", new_callable=AsyncMock
-        ):
-            await manager._evict_lru_client()
+        monkeypatch.setattr(manager, "_start_client", AsyncMock())
+        await manager._evict_lru_client()
 
         # Root should have been shutdown (it was oldest)
         # Note: root_env.client is now None after shutdown, but we captured the mock
@@ -250,7 +241,6 @@ class TestGetAllActiveClients:
 class TestShutdownAll:
     """Tests for shutdown_all method."""
 
-    @pytest.mark.asyncio
     async def test_shuts_down_all_clients(self, tmp_path):
         """Should shutdown all active clients."""
         (tmp_path / "pyproject.toml").write_text("")
@@ -350,8 +340,7 @@ class TestFileTracking:
 class TestRestartEnvironment:
     """Tests for restart_environment method."""
 
-    @pytest.mark.asyncio
-    async def test_restarts_specific_environment(self, tmp_path):
+    async def test_restarts_specific_environment(self, tmp_path, monkeypatch):
         """Should restart a specific environment and re-open files."""
         (tmp_path / "pyproject.toml").write_text("")
 
@@ -377,8 +366,8 @@ class TestRestartEnvironment:
             e.client = new_client
             manager._active_count += 1
 
-        with patch.object(manager, "_start_client", side_effect=mock_start):
-            await manager.restart_environment(str(tmp_path))
+        monkeypatch.setattr(manager, "_start_client", mock_start)
+        await manager.restart_environment(str(tmp_path))
 
         # Old client should be shutdown
         old_client.shutdown.assert_called_once()
@@ -392,7 +381,6 @@ class TestRestartEnvironment:
         assert call_args[0][0] == "textDocument/didOpen"
         assert call_args[0][1]["textDocument"]["uri"] == test_file_uri
 
-    @pytest.mark.asyncio
     async def test_raises_for_unknown_environment(self, tmp_path):
         """Should raise ValueError for unknown environment."""
         (tmp_path / "pyproject.toml").write_text("")
@@ -4,18 +4,26 @@ Unit tests for MCP tools exposed by pyright-mcp.
 
 import asyncio
 from pathlib import Path
+from types import MappingProxyType
+from typing import cast
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from fastmcp import Context
 
-from jons_mcp_pyright import ensure_file_uri, ensure_pyright
 from jons_mcp_pyright import server as server_module
 from jons_mcp_pyright.environment import EnvironmentState
+from jons_mcp_pyright.exceptions import PyrightNotInitializedError
 from jons_mcp_pyright.manager import PyrightClientManager
+
+# The tools are plain async functions that server.py registers with
+# mcp.tool(), so tests call them directly and exercise the business logic
+# without FastMCP's argument validation and dispatch layer
 from jons_mcp_pyright.tools import (
     definition,
     diagnostics,
     document_symbols,
+    list_environments,
     preview_rename,
     references,
     restart_server,
@@ -24,6 +32,7 @@ from jons_mcp_pyright.tools import (
     type_info,
 )
 from jons_mcp_pyright.tools.language import _get_methods_via_completion
+from jons_mcp_pyright.utils import ensure_file_uri, path_to_file_uri
 
 
 def create_mock_client():
@@ -36,12 +45,47 @@ def create_mock_client():
     return mock_client
 
 
-def setup_mock_manager(mock_client, tmp_path=None):
+class FakePyrightClient:
+    """Minimal stand-in for PyrightClient that records requests in a plain list.
+
+    Cheaper than create_mock_client() for tests that only stub responses and
+    check which requests went out.
+    """
+
+    def __init__(self, request_return=None, request_side_effect=None):
+        self._initialized = True
+        self.project_root = Path("/test/project")
+        self.request_calls: list[tuple[str, dict | None]] = []
+        self.notify_calls: list[tuple[str, dict | None]] = []
+        self._request_return = request_return
+        self._request_side_effect = list(request_side_effect or [])
+
+    def is_initialized(self) -> bool:
+        return self._initialized
+
+    async def request(self, method, params=None):
+        self.request_calls.append((method, params))
+        if self._request_side_effect:
+            value = self._request_side_effect.pop(0)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return self._request_return
+
+    async def notify(self, method, params=None):
+        self.notify_calls.append((method, params))
+
+    async def shutdown(self):
+        pass
+
+
+def setup_mock_manager(mock_client, tmp_path=None, initialized=True):
     """Set up a mock manager with the given client.
 
     Args:
         mock_client: The mock PyrightClient to use
         tmp_path: Optional tmp_path for creating environment state
+        initialized: Whether the client and server report initialization done
 
     Returns:
         The mock manager
@@ -52,6 +96,10 @@ def setup_mock_manager(mock_client, tmp_path=None):
     if not default_file.exists():
         default_file.write_text("# test\n")
     mock_client.project_root = project_root
+    if isinstance(mock_client, FakePyrightClient):
+        mock_client._initialized = initialized
+    else:
+        mock_client.is_initialized = MagicMock(return_value=initialized)
 
     # Create a mock environment state
     mock_env = MagicMock(spec=EnvironmentState)
@@ -90,53 +138,179 @@ def setup_mock_manager(mock_client, tmp_path=None):
     mock_manager.get_all_environments = MagicMock(return_value=[mock_env])
 
     server_module.manager = mock_manager
-    server_module.initialization_complete = True
+    server_module.initialization_complete = initialized
 
     return mock_manager
 
 
-class TestUtilityFunctions:
-    """Test utility functions."""
+# Canned LSP responses shared by the tool tests; the tools never mutate them
+_MOCK_LOCATION = {
+    "uri": "file:///test.py",
+    "range": {
+        "start": {"line": 0, "character": 0},
+        "end": {"line": 5, "character": 10},
+    },
+}
+
+_MOCK_REFERENCES = [
+    {
+        "uri": "file:///test1.py",
+        "range": {"start": {"line": 1, "character": 0}},
+    },
+    {
+        "uri": "file:///test2.py",
+        "range": {"start": {"line": 5, "character": 10}},
+    },
+]
+
+_MOCK_SYMBOLS = [
+    {
+        "name": "Calculator",
+        "kind": 5,  # Class
+        "children": [
+            {"name": "__init__", "kind": 9},  # Constructor
+            {"name": "add", "kind": 6},  # Method
+        ],
+    }
+]
+
+_MOCK_RENAME_EDIT = {
+    "changes": {
+        "file:///test.py": [{"range": {"start": {"line": 10}}, "newText": "new_name"}]
+    }
+}
+
+# Completion items of mixed kinds; only the method and function are kept
+_MOCK_COMPLETION_ITEMS = [
+    {"label": "a_method", "kind": 2, "detail": "(self) -> None"},  # Method
+    {"label": "a_function", "kind": 3, "detail": "() -> int"},  # Function
+    {"label": "a_property", "kind": 10, "detail": "int"},  # Property - excluded
+    {"label": "a_field", "kind": 5, "detail": "str"},  # Field - excluded
+]
+
+
+class _NoopCtx:
+    """A pass-through MCP context; tools only call its logging methods."""
+
+    async def debug(self, *args, **kwargs):
+        pass
+
+    async def info(self, *args, **kwargs):
+        pass
+
+    async def warning(self, *args, **kwargs):
+        pass
+
+    async def error(self, *args, **kwargs):
+        pass
+
+
+NOOP_CTX = cast(Context, _NoopCtx())
+
+# Tools take one-based positions; line=11, character=6 reaches pyright as 10:5
+_POSITION = {"line": 10, "character": 5}
+
+
+def _position_request(uri, **extra):
+    """Build the params of a position request on uri at _POSITION."""
+    return {"textDocument": {"uri": uri}, "position": _POSITION, **extra}
+
+
+_PAGINATION_KEYS = {"items", "totalItems", "offset", "limit", "hasMore"}
+
+
+def _assert_paginated(result, expected_len):
+    """Assert result is a paginated response holding expected_len items."""
+    assert _PAGINATION_KEYS <= result.keys()
+    assert len(result["items"]) == expected_len
+
+
+def _areturn(value):
+    """Build a plain async stub returning value, for calls that are not asserted."""
+
+    async def _stub(*args, **kwargs):
+        return value
 
-    def test_ensure_file_uri_already_uri(self):
-        """Test ensure_file_uri with existing URI."""
-        uri = "file:///home/user/test.py"
-        assert ensure_file_uri(uri) == uri
+    return _stub
 
-    def test_ensure_file_uri_absolute_path(self, tmp_path: Path):
-        """Test ensure_file_uri with absolute path."""
-        file_path = tmp_path / "test.py"
-        expected = f"file://{file_path.absolute()}"
-        assert ensure_file_uri(str(file_path)) == expected
 
-    def test_ensure_file_uri_relative_path(self, tmp_path: Path, monkeypatch):
-        """Test ensure_file_uri with relative path."""
-        monkeypatch.chdir(tmp_path)
-        file_path = "src/test.py"
-        expected = f"file://{tmp_path.absolute()}/src/test.py"
-        assert ensure_file_uri(file_path) == expected
+@pytest.fixture(scope="session")
+def shared_project(tmp_path_factory):
+    """A read-only project holding test.py, and that file's URI.
+
+    Built once per session for tests that only send requests against
+    test.py and never write to the project.
+    """
+    root = tmp_path_factory.mktemp("shared")
+    (root / "test.py").write_text("# test\n")
+    return root, f"file://{root / 'test.py'}"
+
+
+@pytest.fixture
+def mock_client():
+    """A fresh mock pyright client for one test."""
+    return create_mock_client()
+
+
+@pytest.fixture
+def mock_manager(mock_client, tmp_path: Path):
+    """A mock manager serving mock_client, installed as the server's manager.
+
+    The autouse mock_initialization_state fixture in conftest restores the
+    server globals afterwards.
+    """
+    return setup_mock_manager(mock_client, tmp_path)
 
-    def test_ensure_pyright_not_initialized(self):
-        """Test ensure_pyright when manager is not initialized."""
-        server_module.manager = None
-        with pytest.raises(Exception, match="Manager is not initialized"):
-            ensure_pyright()
 
-    def test_ensure_pyright_initialized(self, tmp_path: Path):
-        """Test ensure_pyright with initialized client."""
-        mock_client = create_mock_client()
-        setup_mock_manager(mock_client, tmp_path)
+@pytest.fixture(scope="module")
+def sample_diagnostics():
+    """Published diagnostics keyed by project-relative path.
+
+    Read-only so tests cannot mutate them. Two of the files share a name in
+    different directories.
+    """
+    return MappingProxyType(
+        {
+            "test.py": ({"severity": 1, "message": "Error 1"},),
+            "test2.py": ({"severity": 2, "message": "Warning 1"},),
+            "pkg/a/utils.py": ({"severity": 1, "message": "Error in a"},),
+            "pkg/b/utils.py": ({"severity": 2, "message": "Warning in b"},),
+        }
+    )
 
-        result = ensure_pyright()
-        assert result == mock_client
+
+@pytest.fixture
+def diagnostics_state(sample_diagnostics, mock_manager, tmp_path: Path):
+    """Serve sample_diagnostics as the manager's published diagnostics.
+
+    The files are created under tmp_path and keyed by their real URIs;
+    single-file lookups convert the path with ensure_file_uri as the manager does.
+    """
+    for name in sample_diagnostics:
+        file_path = tmp_path / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if not file_path.exists():
+            file_path.write_text("# test\n")
+    diags = MappingProxyType(
+        {
+            path_to_file_uri(tmp_path / name): file_diags
+            for name, file_diags in sample_diagnostics.items()
+        }
+    )
+    mock_manager.get_all_diagnostics = MagicMock(return_value=diags)
+    mock_manager.get_diagnostics_for_file = MagicMock(
+        side_effect=lambda file_path: diags.get(
+            ensure_file_uri(file_path, tmp_path), []
+        )
+    )
+    return diags
 
 
 class TestCoreLanguageFeatures:
     """Test core language feature tools."""
 
-    @pytest.mark.asyncio
     async def test_relative_paths_resolve_from_project_root(
-        self, tmp_path: Path, monkeypatch
+        self, tmp_path: Path, mock_client, monkeypatch
     ):
         """Relative tool paths should ignore the MCP process cwd."""
         project_root = tmp_path / "project"
@@ -148,7 +322,6 @@ class TestCoreLanguageFeatures:
         (other_cwd / "test.py").write_text("# wrong file\n")
         monkeypatch.chdir(other_cwd)
 
-        mock_client = create_mock_client()
         mock_client.request = AsyncMock(return_value={"contents": "ok"})
         setup_mock_manager(mock_client, project_root)
 
@@ -163,7 +336,6 @@ class TestCoreLanguageFeatures:
             },
         )
 
-    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "tool_call",
         [
@@ -190,7 +362,7 @@ class TestCoreLanguageFeatures:
         ],
     )
     async def test_file_tools_reject_unsafe_paths(
-        self, tmp_path: Path, tool_call, path_case: str
+        self, tmp_path: Path, mock_client, tool_call, path_case: str
     ):
         """Every file-taking public tool validates paths before LSP/filesystem work."""
         root = tmp_path / "project"
@@ -210,7 +382,6 @@ class TestCoreLanguageFeatures:
             "directory": str(root),
         }
 
-        mock_client = create_mock_client()
         setup_mock_manager(mock_client, root)
 
         result = await tool_call(paths[path_case])
@@ -219,125 +390,73 @@ class TestCoreLanguageFeatures:
         mock_client.request.assert_not_called()
         mock_client.notify.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_symbol_info(self, tmp_path: Path, monkeypatch):
+    async def test_symbol_info(self, shared_project):
         """Test symbol_info tool."""
-        monkeypatch.chdir(tmp_path)
-        test_file = tmp_path / "test.py"
-        test_file.write_text("# test")
+        project_root, expected_uri = shared_project
 
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock(
-            return_value={"contents": {"kind": "markdown", "value": "Test hover info"}}
+        client = FakePyrightClient(
+            request_return={
+                "contents": {"kind": "markdown", "value": "Test hover info"}
+            }
         )
+        setup_mock_manager(client, project_root)
 
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
         result = await symbol_info(
-            file_path="test.py", line=11, character=6, ctx=mock_ctx
+            file_path="test.py", line=11, character=6, ctx=NOOP_CTX
         )
 
         assert result["content"] == "Test hover info"
-        mock_client.request.assert_called_once_with(
-            "textDocument/hover",
-            {
-                "textDocument": {"uri": f"file://{test_file.absolute()}"},
-                "position": {"line": 10, "character": 5},
-            },
-        )
-
-    @pytest.mark.asyncio
-    async def test_symbol_info_no_info(self, tmp_path: Path):
-        """Test symbol_info tool with no information."""
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock(return_value=None)
-
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
-        result = await symbol_info(
-            file_path="test.py", line=11, character=6, ctx=mock_ctx
-        )
-
-        assert result == {"content": "No symbol information available"}
-
-    @pytest.mark.asyncio
-    async def test_symbol_info_still_initializing(self, tmp_path: Path):
-        """Test symbol_info tool when pyright is still initializing."""
-        mock_client = create_mock_client()
-        mock_client.is_initialized = MagicMock(return_value=False)
+        assert client.request_calls == [
+            ("textDocument/hover", _position_request(expected_uri))
+        ]
 
-        setup_mock_manager(mock_client, tmp_path)
-        server_module.initialization_complete = False
+    @pytest.mark.parametrize(
+        ("initialized", "expected"),
+        [
+            pytest.param(
+                True, {"content": "No symbol information available"}, id="no_info"
+            ),
+            pytest.param(
+                False,
+                {"error": {"code": "pyright_initializing", "retryable": True}},
+                id="initializing",
+            ),
+        ],
+    )
+    async def test_symbol_info_without_hover(
+        self, initialized, expected, tmp_path: Path, mock_client
+    ):
+        """Test symbol_info with no hover result or while pyright initializes."""
+        mock_client.request = _areturn(None)
+        setup_mock_manager(mock_client, tmp_path, initialized=initialized)
 
-        mock_ctx = AsyncMock()
         result = await symbol_info(
-            file_path="test.py", line=11, character=6, ctx=mock_ctx
+            file_path="test.py", line=11, character=6, ctx=NOOP_CTX
         )
 
-        assert result["error"]["code"] == "pyright_initializing"
-        assert result["error"]["retryable"] is True
-
-    @pytest.mark.asyncio
-    async def test_definition(self, tmp_path: Path):
-        """Test definition tool."""
-        mock_location = {
-            "uri": "file:///test.py",
-            "range": {
-                "start": {"line": 0, "character": 0},
-                "end": {"line": 5, "character": 10},
-            },
-        }
-
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock(return_value=mock_location)
-
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
-        result = await definition(
-            file_path="test.py", line=11, character=6, ctx=mock_ctx
-        )
-
-        assert result == {
-            "items": [
-                {
-                    "uri": "file:///test.py",
-                    "range": {
-                        "start": {"line": 1, "character": 1},
-                        "end": {"line": 6, "character": 11},
-                    },
-                }
-            ],
-            "totalItems": 1,
-        }
-
-    @pytest.mark.asyncio
-    async def test_type_definition(self, tmp_path: Path, monkeypatch):
-        """Test type_definition tool."""
-        monkeypatch.chdir(tmp_path)
-        test_file = tmp_path / "test.py"
-        test_file.write_text("# test")
-
-        mock_location = {
-            "uri": "file:///test.py",
-            "range": {
-                "start": {"line": 0, "character": 0},
-                "end": {"line": 5, "character": 10},
-            },
-        }
-
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock(return_value=mock_location)
+        if "error" in expected:
+            error = result["error"]
+            assert {key: error[key] for key in expected["error"]} == expected["error"]
+        else:
+            assert result == expected
 
-        setup_mock_manager(mock_client, tmp_path)
+    @pytest.mark.parametrize(
+        ("tool", "method"),
+        [
+            pytest.param(definition, "textDocument/definition", id="definition"),
+            pytest.param(
+                type_definition, "textDocument/typeDefinition", id="type_definition"
+            ),
+        ],
+    )
+    async def test_definition_tools(self, tool, method, shared_project):
+        """Test definition and type_definition tools."""
+        client = FakePyrightClient(request_return=_MOCK_LOCATION)
+        setup_mock_manager(client, shared_project[0])
 
-        mock_ctx = AsyncMock()
-        result = await type_definition(
-            file_path="test.py", line=11, character=6, ctx=mock_ctx
-        )
+        result = await tool(file_path="test.py", line=11, character=6, ctx=NOOP_CTX)
 
+        assert [call[0] for call in client.request_calls] == [method]
         assert result == {
             "items": [
                 {
@@ -351,87 +470,38 @@ class TestCoreLanguageFeatures:
             "totalItems": 1,
         }
 
-    @pytest.mark.asyncio
-    async def test_references(self, tmp_path: Path, monkeypatch):
+    async def test_references(self, shared_project):
         """Test references tool."""
-        monkeypatch.chdir(tmp_path)
-        test_file = tmp_path / "test.py"
-        test_file.write_text("# test")
-
-        mock_refs = [
-            {
-                "uri": "file:///test1.py",
-                "range": {"start": {"line": 1, "character": 0}},
-            },
-            {
-                "uri": "file:///test2.py",
-                "range": {"start": {"line": 5, "character": 10}},
-            },
-        ]
+        project_root, expected_uri = shared_project
 
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock(return_value=mock_refs)
-
-        setup_mock_manager(mock_client, tmp_path)
+        client = FakePyrightClient(request_return=_MOCK_REFERENCES)
+        setup_mock_manager(client, project_root)
 
         result = await references(
             file_path="test.py", line=11, character=6, include_declaration=False
         )
 
-        # Result should be paginated response
-        assert "items" in result
-        assert "totalItems" in result
-        assert "offset" in result
-        assert "limit" in result
-        assert "hasMore" in result
-
         # Check that the items have the expected URIs
-        assert len(result["items"]) == len(mock_refs)
+        _assert_paginated(result, len(_MOCK_REFERENCES))
         uris = [item["uri"] for item in result["items"]]
-        expected_uris = [item["uri"] for item in mock_refs]
+        expected_uris = [item["uri"] for item in _MOCK_REFERENCES]
         assert set(uris) == set(expected_uris)
-        mock_client.request.assert_called_once_with(
-            "textDocument/references",
-            {
-                "textDocument": {"uri": f"file://{test_file.absolute()}"},
-                "position": {"line": 10, "character": 5},
-                "context": {"includeDeclaration": False},
-            },
-        )
-
-    @pytest.mark.asyncio
-    async def test_document_symbols(self, tmp_path: Path):
-        """Test document_symbols tool."""
-        mock_symbols = [
-            {
-                "name": "Calculator",
-                "kind": 5,  # Class
-                "children": [
-                    {"name": "__init__", "kind": 9},  # Constructor
-                    {"name": "add", "kind": 6},  # Method
-                ],
-            }
+        assert client.request_calls == [
+            (
+                "textDocument/references",
+                _position_request(expected_uri, context={"includeDeclaration": False}),
+            )
         ]
 
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock(return_value=mock_symbols)
-
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
-        result = await document_symbols(file_path="test.py", ctx=mock_ctx)
+    async def test_document_symbols(self, mock_client, mock_manager):
+        """Test document_symbols tool."""
+        mock_client.request = _areturn(_MOCK_SYMBOLS)
 
-        # Result should be paginated response
-        assert "items" in result
-        assert "totalItems" in result
-        assert "offset" in result
-        assert "limit" in result
-        assert "hasMore" in result
+        result = await document_symbols(file_path="test.py", ctx=NOOP_CTX)
 
-        # Check that the items have the expected symbols
-        # Note: The function flattens hierarchical symbols, so we should have 3 items:
+        # The function flattens hierarchical symbols, so we should have 3 items:
         # Calculator, __init__, and add
-        assert len(result["items"]) == 3
+        _assert_paginated(result, 3)
         names = [item["name"] for item in result["items"]]
         assert "Calculator" in names
         assert "__init__" in names
@@ -441,216 +511,155 @@ class TestCoreLanguageFeatures:
 class TestCodeIntelligence:
     """Test code intelligence tools."""
 
-    @pytest.mark.asyncio
-    async def test_diagnostics_all(self, tmp_path: Path):
+    async def test_diagnostics_all(self, diagnostics_state):
         """Test diagnostics tool for all files."""
-        mock_diagnostics = {
-            "file:///test1.py": [{"severity": 1, "message": "Error 1"}],
-            "file:///test2.py": [{"severity": 2, "message": "Warning 1"}],
-        }
-
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-        mock_manager.get_all_diagnostics = MagicMock(return_value=mock_diagnostics)
-
         result = await diagnostics()
 
-        # Result should be paginated response for the flattened list
-        assert "items" in result
-        assert "totalItems" in result
-        assert "offset" in result
-        assert "limit" in result
-        assert "hasMore" in result
-        # Check that items contain diagnostics from both files
-        assert len(result["items"]) == 2
-
-    @pytest.mark.asyncio
-    async def test_diagnostics_single_file(self, tmp_path: Path):
-        """Test diagnostics tool for single file."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
-        # Set up diagnostics for the environment
-        mock_manager.get_diagnostics_for_file = MagicMock(
-            return_value=[{"severity": 1, "message": "Error 1"}]
-        )
-
-        test_file = tmp_path / "test1.py"
-        test_file.write_text("# test\n")
-        result = await diagnostics(file_path=str(test_file))
-
-        # Result should be paginated response for single file diagnostics
-        assert "items" in result
-        assert "totalItems" in result
-        assert "offset" in result
-        assert "limit" in result
-        assert "hasMore" in result
-        # Should contain only diagnostics from test1.py
-        assert len(result["items"]) == 1
-        assert result["items"][0]["message"] == "Error 1"
-
-    @pytest.mark.asyncio
-    async def test_preview_rename(self, tmp_path: Path):
-        """Test preview_rename tool."""
-        mock_edit = {
-            "changes": {
-                "file:///test.py": [
-                    {"range": {"start": {"line": 10}}, "newText": "new_name"}
-                ]
-            }
-        }
+        # Items contain diagnostics from every file, flattened
+        _assert_paginated(result, len(diagnostics_state))
 
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock()
-        mock_client.request.side_effect = [
-            {"range": {"start": {"line": 10}}},  # prepareRename
-            mock_edit,  # rename
-            [],  # references supplement
-        ]
+    @pytest.mark.parametrize(
+        ("file_path", "message"),
+        [
+            ("test.py", "Error 1"),
+            ("pkg/a/utils.py", "Error in a"),
+            ("pkg/b/utils.py", "Warning in b"),
+        ],
+    )
+    async def test_diagnostics_single_file(
+        self, file_path, message, tmp_path: Path, diagnostics_state
+    ):
+        """Test diagnostics tool for single file, telling same-named files apart."""
+        result = await diagnostics(file_path=file_path)
 
-        setup_mock_manager(mock_client, tmp_path)
+        # Should contain only diagnostics from the requested file
+        _assert_paginated(result, 1)
+        assert result["items"][0]["message"] == message
+        assert result["items"][0]["uri"] == path_to_file_uri(tmp_path / file_path)
 
-        mock_ctx = AsyncMock()
-        result = await preview_rename(
-            file_path="test.py",
-            line=11,
-            character=6,
-            new_name="new_name",
-            prewarm=False,
-            ctx=mock_ctx,
-        )
-
-        assert result == {
-            "edits": [
+    @pytest.mark.parametrize(
+        ("responses", "expected"),
+        [
+            pytest.param(
+                (
+                    {"range": {"start": {"line": 10}}},  # prepareRename
+                    _MOCK_RENAME_EDIT,  # rename
+                    [],  # references supplement
+                ),
                 {
-                    "uri": "file:///test.py",
-                    "range": {
-                        "start": {"line": 11, "character": 1},
-                        "end": {"line": 11, "character": 1},
-                    },
-                    "newText": "new_name",
-                }
-            ],
-            "totalEdits": 1,
-            "warnings": ["Prewarm was disabled; unopened files may be missed."],
-        }
-
-    @pytest.mark.asyncio
-    async def test_preview_rename_not_allowed(self, tmp_path: Path):
-        """Test preview_rename tool when rename is not allowed."""
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock(return_value=None)
-
-        setup_mock_manager(mock_client, tmp_path)
+                    "edits": [
+                        {
+                            "uri": "file:///test.py",
+                            "range": {
+                                "start": {"line": 11, "character": 1},
+                                "end": {"line": 11, "character": 1},
+                            },
+                            "newText": "new_name",
+                        }
+                    ],
+                    "totalEdits": 1,
+                    "warnings": ["Prewarm was disabled; unopened files may be missed."],
+                },
+                id="allowed",
+            ),
+            pytest.param(
+                (None,),  # prepareRename
+                {
+                    "error": {
+                        "code": "rename_not_available",
+                        "message": "Cannot rename at this position",
+                    }
+                },
+                id="not_allowed",
+            ),
+        ],
+    )
+    async def test_preview_rename(self, responses, expected, shared_project):
+        """Test preview_rename tool when rename is and is not allowed."""
+        client = FakePyrightClient(request_side_effect=responses)
+        setup_mock_manager(client, shared_project[0])
 
-        mock_ctx = AsyncMock()
         result = await preview_rename(
             file_path="test.py",
             line=11,
             character=6,
             new_name="new_name",
-            ctx=mock_ctx,
+            prewarm=False,
+            ctx=NOOP_CTX,
         )
 
-        assert result["error"]["code"] == "rename_not_available"
-        assert result["error"]["message"] == "Cannot rename at this position"
+        if "error" in expected:
+            error = result["error"]
+            assert {key: error[key] for key in expected["error"]} == expected["error"]
+        else:
+            assert result == expected
 
 
 class TestPyrightExtensions:
     """Test pyright-specific extension tools."""
 
-    @pytest.mark.asyncio
-    async def test_restart_server_all(self, tmp_path: Path):
+    async def test_restart_server_all(self, mock_manager):
         """Test restart_server tool restarts all environments."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
         # Set up the mock manager for restart_all
         mock_manager.restart_all = AsyncMock()
 
-        mock_ctx = AsyncMock()
-        result = await restart_server(ctx=mock_ctx)
+        result = await restart_server(ctx=NOOP_CTX)
 
         assert result == {"status": "restarted", "scope": "all"}
         mock_manager.restart_all.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_restart_server_single_environment(self, tmp_path: Path):
-        """Test restart_server tool for a specific file."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
-        # Set up the mock manager for restart_environment
-        mock_manager.restart_environment = AsyncMock()
-
-        mock_ctx = AsyncMock()
-        result = await restart_server(file_path="test.py", ctx=mock_ctx)
-
-        assert result["status"] == "restarted"
-        assert result["scope"] == "environment"
-        assert result["env_id"] == str(tmp_path)
-        # restart_environment is called with the env_id (project root), not the file path
-        mock_manager.restart_environment.assert_called_once_with(str(tmp_path))
-
-    @pytest.mark.asyncio
-    async def test_restart_server_by_env_id(self, tmp_path: Path):
-        """Test restart_server tool with env_id parameter."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
-        # Set up the mock manager for restart_environment
+    @pytest.mark.parametrize(
+        ("by_env_id", "expected"),
+        [
+            (False, {"file": "test.py"}),
+            (True, {}),
+        ],
+        ids=["file_path", "env_id"],
+    )
+    async def test_restart_server_single_environment(
+        self, by_env_id, expected, tmp_path: Path, mock_manager
+    ):
+        """Test restart_server tool for one environment, by file or by env_id."""
         mock_manager.restart_environment = AsyncMock()
+        target = {"env_id": str(tmp_path)} if by_env_id else {"file_path": "test.py"}
 
-        mock_ctx = AsyncMock()
-        result = await restart_server(env_id=str(tmp_path), ctx=mock_ctx)
+        result = await restart_server(**target, ctx=NOOP_CTX)
 
+        # Extra expected keys hold project-relative paths, reported as URIs
         assert result == {
             "status": "restarted",
             "scope": "environment",
             "env_id": str(tmp_path),
+            **{key: (tmp_path / path).as_uri() for key, path in expected.items()},
         }
+        # restart_environment is called with the env_id (project root), not the file path
         mock_manager.restart_environment.assert_called_once_with(str(tmp_path))
 
-    @pytest.mark.asyncio
-    async def test_restart_server_env_id_not_found(self, tmp_path: Path):
+    async def test_restart_server_env_id_not_found(self, mock_manager):
         """Test restart_server tool with non-existent env_id."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
         # Set up the mock manager to raise ValueError for unknown env_id
         mock_manager.restart_environment = AsyncMock(
             side_effect=ValueError("No environment found with ID: /nonexistent")
         )
 
-        mock_ctx = AsyncMock()
-        result = await restart_server(env_id="/nonexistent", ctx=mock_ctx)
+        result = await restart_server(env_id="/nonexistent", ctx=NOOP_CTX)
 
         assert result["error"]["code"] == "environment_not_found"
         assert "No environment found" in result["error"]["message"]
 
-    @pytest.mark.asyncio
-    async def test_restart_server_not_running(self):
+    async def test_restart_server_not_running(self, monkeypatch):
         """Test restart_server tool when server not running."""
-        from jons_mcp_pyright.exceptions import PyrightNotInitializedError
+        monkeypatch.setattr(server_module, "manager", None)
 
-        server_module.manager = None
-
-        mock_ctx = AsyncMock()
         with pytest.raises(PyrightNotInitializedError):
-            await restart_server(ctx=mock_ctx)
+            await restart_server(ctx=NOOP_CTX)
 
 
 class TestListEnvironments:
     """Test list_environments tool."""
 
-    @pytest.mark.asyncio
-    async def test_list_environments(self, tmp_path: Path):
+    async def test_list_environments(self, tmp_path: Path, mock_manager):
         """Test listing environments."""
-        from jons_mcp_pyright.tools.extensions import list_environments
-
-        mock_client = create_mock_client()
-        setup_mock_manager(mock_client, tmp_path)
-
         result = await list_environments()
 
         assert "total" in result
@@ -666,13 +675,9 @@ class TestListEnvironments:
         assert env["is_active"] is True
         assert "opened_files_count" in env
 
-    @pytest.mark.asyncio
-    async def test_list_environments_not_running(self):
+    async def test_list_environments_not_running(self, monkeypatch):
         """Test list_environments when server not running."""
-        from jons_mcp_pyright.exceptions import PyrightNotInitializedError
-        from jons_mcp_pyright.tools.extensions import list_environments
-
-        server_module.manager = None
+        monkeypatch.setattr(server_module, "manager", None)
 
         with pytest.raises(PyrightNotInitializedError):
             await list_environments()
@@ -681,10 +686,8 @@ class TestListEnvironments:
 class TestTypeInfo:
     """Test type_info tool and _get_methods_via_completion helper."""
 
-    @pytest.mark.asyncio
-    async def test_type_info_class(self, tmp_path: Path, monkeypatch):
+    async def test_type_info_class(self, tmp_path: Path, mock_client, mock_manager):
         """Test getting type info for a class instance."""
-        monkeypatch.chdir(tmp_path)
         test_file = tmp_path / "test.py"
         test_file.write_text("""class MyClass:
     value: int
@@ -693,8 +696,6 @@ class TestTypeInfo:
 obj = MyClass()
 """)
 
-        mock_client = create_mock_client()
-
         # Mock responses in sequence
         type_def_response = {
             "uri": f"file://{test_file.absolute()}",
@@ -723,11 +724,8 @@ obj = MyClass()
             ]
         )
 
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
         result = await type_info(
-            file_path=str(test_file), line=5, character=1, ctx=mock_ctx
+            file_path=str(test_file), line=5, character=1, ctx=NOOP_CTX
         )
 
         assert result["typeName"] == "MyClass"
@@ -737,15 +735,11 @@ obj = MyClass()
         assert {field["name"] for field in result["fields"]} == {"value", "name"}
         assert result["methods"]["totalItems"] >= 2
 
-    @pytest.mark.asyncio
-    async def test_type_info_primitive(self, tmp_path: Path, monkeypatch):
+    async def test_type_info_primitive(self, tmp_path: Path, mock_client, mock_manager):
         """Test fallback to hover for primitive types."""
-        monkeypatch.chdir(tmp_path)
         test_file = tmp_path / "test.py"
         test_file.write_text("x = 42\n")
 
-        mock_client = create_mock_client()
-
         # No type definition for primitives
         type_def_response = None
 
@@ -770,11 +764,8 @@ obj = MyClass()
             ]
         )
 
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
         result = await type_info(
-            file_path=str(test_file), line=1, character=1, ctx=mock_ctx
+            file_path=str(test_file), line=1, character=1, ctx=NOOP_CTX
         )
 
         assert result["typeName"] == "int"
@@ -783,40 +774,34 @@ obj = MyClass()
         assert result["fields"] == []
         assert result["methods"]["totalItems"] >= 2
 
-    @pytest.mark.asyncio
-    async def test_type_info_no_type_found(self, tmp_path: Path, monkeypatch):
+    async def test_type_info_no_type_found(
+        self, tmp_path: Path, mock_client, mock_manager
+    ):
         """Test error when neither typeDefinition nor hover returns useful info."""
-        monkeypatch.chdir(tmp_path)
+        # setup_mock_manager's default test.py holds only a comment
         test_file = tmp_path / "test.py"
-        test_file.write_text("# empty\n")
 
-        mock_client = create_mock_client()
         mock_client.request = AsyncMock(
             side_effect=[
                 None,  # hover
             ]
         )
 
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
         result = await type_info(
-            file_path=str(test_file), line=1, character=1, ctx=mock_ctx
+            file_path=str(test_file), line=1, character=1, ctx=NOOP_CTX
         )
 
         assert "error" in result
         assert result["error"]["code"] == "type_not_found"
         assert "Could not determine type" in result["error"]["message"]
 
-    @pytest.mark.asyncio
-    async def test_type_info_pagination(self, tmp_path: Path, monkeypatch):
+    async def test_type_info_pagination(
+        self, tmp_path: Path, mock_client, mock_manager
+    ):
         """Test method pagination with offset/limit parameters."""
-        monkeypatch.chdir(tmp_path)
         test_file = tmp_path / "test.py"
         test_file.write_text("x = [1, 2, 3]\n")
 
-        mock_client = create_mock_client()
-
         # Primitive type via hover
         hover_response = {"contents": {"kind": "markdown", "value": "x: list[int]"}}
 
@@ -839,10 +824,6 @@ obj = MyClass()
 
         mock_client.request = AsyncMock(side_effect=side_effects)
 
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
-
         # First page: offset=0, limit=10
         result = await type_info(
             file_path=str(test_file),
@@ -850,7 +831,7 @@ obj = MyClass()
             character=1,
             limit=10,
             offset=0,
-            ctx=mock_ctx,
+            ctx=NOOP_CTX,
         )
 
         assert result["methods"]["totalItems"] == 25
@@ -860,15 +841,13 @@ obj = MyClass()
         assert result["methods"]["hasMore"] is True
         assert result["methods"]["nextOffset"] == 10
 
-    @pytest.mark.asyncio
-    async def test_type_info_with_documentation(self, tmp_path: Path, monkeypatch):
+    async def test_type_info_with_documentation(
+        self, tmp_path: Path, mock_client, mock_manager
+    ):
         """Test include_documentation=True includes method docs."""
-        monkeypatch.chdir(tmp_path)
         test_file = tmp_path / "test.py"
         test_file.write_text("x = 'hello'\n")
 
-        mock_client = create_mock_client()
-
         hover_response = {"contents": {"kind": "markdown", "value": "x: str"}}
 
         completion_response = {
@@ -897,15 +876,12 @@ obj = MyClass()
             ]
         )
 
-        setup_mock_manager(mock_client, tmp_path)
-
-        mock_ctx = AsyncMock()
         result = await type_info(
             file_path=str(test_file),
             line=1,
             character=1,
             include_documentation=True,
-            ctx=mock_ctx,
+            ctx=NOOP_CTX,
         )
 
         assert result["typeName"] == "str"
@@ -921,16 +897,13 @@ obj = MyClass()
 class TestGetMethodsViaCompletion:
     """Test _get_methods_via_completion helper function."""
 
-    @pytest.mark.asyncio
-    async def test_dot_already_exists(self, tmp_path: Path, monkeypatch):
+    async def test_dot_already_exists(self, tmp_path: Path, mock_client):
         """Test when dot already exists after variable (no document modification needed)."""
-        monkeypatch.chdir(tmp_path)
         test_file = tmp_path / "test.py"
         # Line has "obj." - dot already exists
         test_file.write_text("obj.method()\n")
         file_uri = f"file://{test_file.absolute()}"
 
-        mock_client = create_mock_client()
         completion_response = {
             "items": [
                 {"label": "method", "kind": 2, "detail": "(self) -> None"},
@@ -953,16 +926,13 @@ class TestGetMethodsViaCompletion:
         # Should NOT have called notify (no document modification)
         mock_client.notify.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_dot_needs_insertion(self, tmp_path: Path, monkeypatch):
+    async def test_dot_needs_insertion(self, tmp_path: Path, mock_client, monkeypatch):
         """Test when dot needs to be inserted (document modification via didChange)."""
-        monkeypatch.chdir(tmp_path)
         test_file = tmp_path / "test.py"
         # No dot after obj
         test_file.write_text("obj\nx = 1\n")
         file_uri = f"file://{test_file.absolute()}"
 
-        mock_client = create_mock_client()
         completion_response = {
             "items": [
                 {"label": "some_method", "kind": 2, "detail": "(self) -> int"},
@@ -985,7 +955,7 @@ class TestGetMethodsViaCompletion:
             2,
             3,
         ]  # First for insert, second for restore
-        monkeypatch.setattr("jons_mcp_pyright.server.manager", mock_manager)
+        monkeypatch.setattr(server_module, "manager", mock_manager)
 
         methods = await _get_methods_via_completion(
             mock_client, file_uri, str(test_file), line=0, character=0
@@ -998,16 +968,13 @@ class TestGetMethodsViaCompletion:
         # Verify versions were incremented
         assert mock_manager.increment_doc_version.call_count == 2
 
-    @pytest.mark.asyncio
-    async def test_empty_completion_results(self, tmp_path: Path, monkeypatch):
+    async def test_empty_completion_results(self, tmp_path: Path, mock_client):
         """Test empty completion results."""
-        monkeypatch.chdir(tmp_path)
         test_file = tmp_path / "test.py"
         test_file.write_text("x.\n")
         file_uri = f"file://{test_file.absolute()}"
 
-        mock_client = create_mock_client()
-        mock_client.request = AsyncMock(return_value={"items": []})
+        mock_client.request = _areturn({"items": []})
 
         methods = await _get_methods_via_completion(
             mock_client, file_uri, str(test_file), line=0, character=0
@@ -1015,33 +982,26 @@ class TestGetMethodsViaCompletion:
 
         assert methods == []
 
-    @pytest.mark.asyncio
-    async def test_filter_methods_only(self, tmp_path: Path, monkeypatch):
-        """Test filtering to only methods/functions (kind 2 and 3)."""
-        monkeypatch.chdir(tmp_path)
+    @pytest.mark.parametrize(
+        "completion_response",
+        [
+            pytest.param({"items": _MOCK_COMPLETION_ITEMS}, id="dict"),
+            pytest.param(_MOCK_COMPLETION_ITEMS, id="list"),
+        ],
+    )
+    async def test_filter_methods_only(
+        self, tmp_path: Path, mock_client, completion_response
+    ):
+        """Test filtering to only methods/functions (kind 2 and 3).
+
+        Pyright may answer with a CompletionList or a bare item list.
+        """
         test_file = tmp_path / "test.py"
         test_file.write_text("obj.\n")
         file_uri = f"file://{test_file.absolute()}"
 
-        mock_client = create_mock_client()
-        completion_response = {
-            "items": [
-                {"label": "a_method", "kind": 2, "detail": "(self) -> None"},  # Method
-                {"label": "a_function", "kind": 3, "detail": "() -> int"},  # Function
-                {
-                    "label": "a_property",
-                    "kind": 10,
-                    "detail": "int",
-                },  # Property - excluded
-                {"label": "a_field", "kind": 5, "detail": "str"},  # Field - excluded
-            ]
-        }
         mock_client.request = AsyncMock(
-            side_effect=[
-                completion_response,
-                {"label": "a_method", "kind": 2, "detail": "(self) -> None"},
-                {"label": "a_function", "kind": 3, "detail": "() -> int"},
-            ]
+            side_effect=[completion_response, *_MOCK_COMPLETION_ITEMS[:2]]
         )
 
         methods = await _get_methods_via_completion(
@@ -1049,23 +1009,14 @@ class TestGetMethodsViaCompletion:
         )
 
         # Should only have method and function, not property or field
-        assert len(methods) == 2
-        names = [m["name"] for m in methods]
-        assert "a_method" in names
-        assert "a_function" in names
-        assert "a_property" not in names
-        assert "a_field" not in names
-
-    @pytest.mark.asyncio
-    async def test_completion_resolve_for_signatures(self, tmp_path: Path, monkeypatch):
+        assert sorted(m["name"] for m in methods) == ["a_function", "a_method"]
+
+    async def test_completion_resolve_for_signatures(self, tmp_path: Path, mock_client):
         """Test completion item resolution to get full signatures."""
-        monkeypatch.chdir(tmp_path)
         test_file = tmp_path / "test.py"
         test_file.write_text("obj.\n")
         file_uri = f"file://{test_file.absolute()}"
 
-        mock_client = create_mock_client()
-
         # Initial completion has no detail
         completion_response = {
             "items": [
@@ -1126,7 +1077,6 @@ class TestDiagnosticWaiter:
         # Waiter should be popped after signaling
         assert uri not in mgr._diagnostic_waiters
 
-    @pytest.mark.asyncio
     async def test_wait_for_diagnostics_success(self, tmp_path: Path):
         """Test wait_for_diagnostics returns True when events are set."""
         mgr = self._make_manager(tmp_path)
@@ -1136,7 +1086,6 @@ class TestDiagnosticWaiter:
         result = await mgr.wait_for_diagnostics([event], timeout=0.1)
         assert result is True
 
-    @pytest.mark.asyncio
     async def test_wait_for_diagnostics_timeout(self, tmp_path: Path):
         """Test wait_for_diagnostics returns False on timeout and cleans up."""
         mgr = self._make_manager(tmp_path)
@@ -1148,7 +1097,6 @@ class TestDiagnosticWaiter:
         # Event should be cleaned up
         assert uri not in mgr._diagnostic_waiters
 
-    @pytest.mark.asyncio
     async def test_wait_for_diagnostics_no_events(self, tmp_path: Path):
         """Test wait_for_diagnostics with empty list returns True immediately."""
         mgr = self._make_manager(tmp_path)
@@ -1203,71 +1151,34 @@ class TestDiagnosticWaiter:
 class TestDiagnosticsWaiterIntegration:
     """Test the diagnostics tool correctly uses the waiter mechanism."""
 
-    @pytest.mark.asyncio
-    async def test_diagnostics_waits_on_new_file(self, tmp_path: Path):
-        """When file is not yet opened, diagnostics should register waiter and wait."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
-        # File not yet opened
-        mock_manager.is_file_opened = MagicMock(return_value=False)
-        mock_manager.get_diagnostics_for_file = MagicMock(
-            return_value=[{"severity": 1, "message": "Error 1"}]
-        )
-
-        result = await diagnostics(file_path=str(tmp_path / "test.py"))
-
-        mock_manager.register_diagnostic_waiter.assert_called_once()
-        mock_manager.wait_for_diagnostics.assert_called_once()
-        assert len(result["items"]) == 1
-
-    @pytest.mark.asyncio
-    async def test_diagnostics_waits_on_stale_file(self, tmp_path: Path):
-        """When file is opened but stale, diagnostics should register waiter and wait."""
-        test_file = tmp_path / "test.py"
-        test_file.write_text("x = 1\n")
-
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
-        # File opened but stale
-        mock_manager.is_file_opened = MagicMock(return_value=True)
-        mock_manager.is_file_stale = MagicMock(return_value=True)
-        mock_manager.get_diagnostics_for_file = MagicMock(
-            return_value=[{"severity": 1, "message": "Error 1"}]
-        )
-
-        result = await diagnostics(file_path=str(test_file))
-
-        mock_manager.register_diagnostic_waiter.assert_called_once()
-        mock_manager.wait_for_diagnostics.assert_called_once()
-        assert len(result["items"]) == 1
-
-    @pytest.mark.asyncio
-    async def test_diagnostics_no_wait_when_current(self, tmp_path: Path):
-        """When file is opened and fresh, no waiter should be registered."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
-        # File opened and current
-        mock_manager.is_file_opened = MagicMock(return_value=True)
-        mock_manager.is_file_stale = MagicMock(return_value=False)
+    @pytest.mark.parametrize(
+        ("opened", "stale", "waits"),
+        [
+            pytest.param(False, False, True, id="new_file"),
+            pytest.param(True, True, True, id="stale_file"),
+            pytest.param(True, False, False, id="current_file"),
+        ],
+    )
+    async def test_diagnostics_waits_unless_current(
+        self, opened, stale, waits, mock_manager
+    ):
+        """Diagnostics wait for a fresh publish unless the opened file is current."""
+        mock_manager.is_file_opened = MagicMock(return_value=opened)
+        mock_manager.is_file_stale = MagicMock(return_value=stale)
         mock_manager.get_diagnostics_for_file = MagicMock(
             return_value=[{"severity": 1, "message": "Error 1"}]
         )
 
-        result = await diagnostics(file_path=str(tmp_path / "test.py"))
+        result = await diagnostics(file_path="test.py")
 
-        mock_manager.register_diagnostic_waiter.assert_not_called()
-        mock_manager.wait_for_diagnostics.assert_not_called()
+        assert mock_manager.register_diagnostic_waiter.call_count == int(waits)
+        assert mock_manager.wait_for_diagnostics.call_count == int(waits)
         assert len(result["items"]) == 1
 
-    @pytest.mark.asyncio
-    async def test_diagnostics_timeout_returns_cached(self, tmp_path: Path):
+    async def test_diagnostics_timeout_returns_cached(
+        self, tmp_path: Path, mock_manager
+    ):
         """When waiter times out, cached diagnostics should still be returned."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
         # File not opened (needs refresh)
         mock_manager.is_file_opened = MagicMock(return_value=False)
         # Timeout
@@ -1284,12 +1195,10 @@ class TestDiagnosticsWaiterIntegration:
         assert len(result["items"]) == 1
         assert result["items"][0]["message"] == "Cached warning"
 
-    @pytest.mark.asyncio
-    async def test_diagnostics_env_mode_refreshes_stale(self, tmp_path: Path):
+    async def test_diagnostics_env_mode_refreshes_stale(
+        self, tmp_path: Path, mock_client, mock_manager
+    ):
         """env_id mode should refresh stale files before returning."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
         # Set up environment with opened files
         mock_env = mock_manager.get_environment.return_value
         mock_env.client = mock_client
@@ -1317,12 +1226,10 @@ class TestDiagnosticsWaiterIntegration:
         mock_manager.wait_for_diagnostics.assert_called_once()
         assert len(result["items"]) == 1
 
-    @pytest.mark.asyncio
-    async def test_diagnostics_aggregate_refreshes_stale(self, tmp_path: Path):
+    async def test_diagnostics_aggregate_refreshes_stale(
+        self, tmp_path: Path, mock_client, mock_manager
+    ):
         """Aggregate mode should refresh stale files across all environments."""
-        mock_client = create_mock_client()
-        mock_manager = setup_mock_manager(mock_client, tmp_path)
-
         # Set up environment with opened files
         mock_env = mock_manager.get_all_environments.return_value[0]
         mock_env.client = mock_client
@@ -3,7 +3,6 @@
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
-import pytest
 from test_mcp_tools import create_mock_client, setup_mock_manager
 
 from jons_mcp_pyright.constants import LSPMethods
@@ -29,7 +28,6 @@ def _raw_diagnostic(uri: str, rule: str, message: str) -> dict[str, object]:
     }
 
 
-@pytest.mark.asyncio
 async def test_diagnostics_filters_file_env_and_aggregate_modes(tmp_path: Path):
     """Public diagnostics consistently apply member report-rule overrides."""
 
@@ -65,7 +63,6 @@ async def test_diagnostics_filters_file_env_and_aggregate_modes(tmp_path: Path):
     assert raw_diagnostic["severity"] == 1
 
 
-@pytest.mark.asyncio
 async def test_diagnostics_pagination_uses_filtered_totals(tmp_path: Path):
     """Pagination metadata is computed after member diagnostic filtering."""
 
@@ -203,7 +200,6 @@ def test_prewarm_candidates_prioritize_symbol_and_skip_ignored_paths(tmp_path: P
     assert result.skipped >= 2
 
 
-@pytest.mark.asyncio
 async def test_preview_rename_does_not_write_files(tmp_path: Path):
     """Previewing a rename returns edits while leaving disk content unchanged."""
     test_file = tmp_path / "test.py"
@@ -243,7 +239,6 @@ async def test_preview_rename_does_not_write_files(tmp_path: Path):
     assert test_file.read_text() == "old_name = 1\nprint(old_name)\n"
 
 
-@pytest.mark.asyncio
 async def test_preview_rename_prewarms_candidates_before_rename(tmp_path: Path):
     """Cold rename previews open likely callers before rename and references."""
     declaration_file = tmp_path / "provider.py"
@@ -325,7 +320,6 @@ async def test_preview_rename_prewarms_candidates_before_rename(tmp_path: Path):
     assert caller_uri in mock_env.opened_files
 
 
-@pytest.mark.asyncio
 async def test_preview_rename_limit_zero_warns_and_skips_prewarm(tmp_path: Path):
     """A zero prewarm limit warns without issuing documentSymbol warm-up calls."""
     test_file = tmp_path / "test.py"
@@ -376,7 +370,6 @@ async def test_preview_rename_limit_zero_warns_and_skips_prewarm(tmp_path: Path)
     assert result["warnings"] == ["Prewarm limit was 0; unopened files may be missed."]
 
 
-@pytest.mark.asyncio
 async def test_preview_rename_unavailable_skips_prewarm(tmp_path: Path):
     """prepareRename failure/unavailability stops before prewarm side effects."""
     test_file = tmp_path / "test.py"
@@ -397,7 +390,6 @@ async def test_preview_rename_unavailable_skips_prewarm(tmp_path: Path):
     mock_client.request.assert_awaited_once()
 
 
-@pytest.mark.asyncio
 async def test_preview_rename_supplements_missing_reference_edits(tmp_path: Path):
     """Reference ranges are added when Pyright rename omits workspace callers."""
     declaration_file = tmp_path / "provider.py"
@@ -3,13 +3,11 @@
 from pathlib import Path
 from unittest.mock import AsyncMock
 
-import pytest
 from test_mcp_tools import create_mock_client, setup_mock_manager
 
 from jons_mcp_pyright.tools import document_symbols
 
 
-@pytest.mark.asyncio
 async def test_document_symbols_normalizes_symbol_information(tmp_path: Path):
     """SymbolInformation responses expose uri/range without raw LSP location."""
     (tmp_path / "test.py").write_text("def f():\n    pass\n")
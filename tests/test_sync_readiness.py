@@ -11,7 +11,6 @@ from jons_mcp_pyright.exceptions import DocumentSyncError
 from jons_mcp_pyright.tools import references, symbol_info
 
 
-@pytest.mark.asyncio
 async def test_document_sync_error_prevents_lsp_request(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ):
@@ -32,7 +31,6 @@ async def test_document_sync_error_prevents_lsp_request(
     mock_client.request.assert_not_called()
 
 
-@pytest.mark.asyncio
 async def test_project_wide_reference_waits_for_readiness(tmp_path: Path):
     """Project-wide reference lookup waits for diagnostics when sync refreshes."""
     (tmp_path / "test.py").write_text("name = 1\nprint(name)\n")
@@ -0,0 +1,50 @@
+"""Unit tests for the ensure_file_uri and ensure_pyright helpers."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from jons_mcp_pyright import ensure_file_uri, ensure_pyright
+from jons_mcp_pyright import server as server_module
+
+# ensure_pyright only reads manager.root_environment.client, so its tests
+# share one bare manager rather than a fully configured mock
+_DUMMY_CLIENT = MagicMock()
+_DUMMY_CLIENT.is_initialized.return_value = True
+_DUMMY_MANAGER = MagicMock()
+_DUMMY_MANAGER.root_environment.client = _DUMMY_CLIENT
+
+
+class TestUtilityFunctions:
+    """Test utility functions."""
+
+    @pytest.mark.parametrize(
+        ("file_path", "expected"),
+        [
+            pytest.param(
+                "file:///home/user/test.py", "file:///home/user/test.py", id="uri"
+            ),
+            pytest.param("{root}/test.py", "file://{root}/test.py", id="absolute"),
+            pytest.param("src/test.py", "file://{root}/src/test.py", id="relative"),
+        ],
+    )
+    def test_ensure_file_uri(self, file_path, expected, tmp_path: Path, monkeypatch):
+        """Test ensure_file_uri with URIs, absolute paths and relative paths."""
+        # Fake the cwd lookup rather than chdir, which is process-global
+        monkeypatch.setattr(Path, "cwd", staticmethod(lambda: tmp_path))
+        root = tmp_path.absolute()
+        file_path, expected = file_path.format(root=root), expected.format(root=root)
+        assert ensure_file_uri(file_path) == expected
+
+    def test_ensure_pyright_not_initialized(self, monkeypatch):
+        """Test ensure_pyright when manager is not initialized."""
+        monkeypatch.setattr(server_module, "manager", None)
+        with pytest.raises(Exception, match="Manager is not initialized"):
+            ensure_pyright()
+
+    def test_ensure_pyright_initialized(self, monkeypatch):
+        """Test ensure_pyright with initialized client."""
+        monkeypatch.setattr(server_module, "manager", _DUMMY_MANAGER)
+
+        assert ensure_pyright() is _DUMMY_CLIENT